@@ -0,0 +1,53 @@
+"""
+Picks Argon2 parameters for this machine, to pin in settings.
+
+Run it once on the production hardware (ideally while it is otherwise idle) and put the printed
+values in the environment. The API never calibrates at startup: every worker would measure
+under different load and they would keep rehashing each other's hashes.
+
+    python -m benchmarks.argon2 --target-ms 250
+"""
+import argparse
+import time
+
+from passlib.context import CryptContext
+
+
+def calibrate_argon2(target_ms: int, memory_cost: int, parallelism: int, max_rounds: int = 20) -> dict:
+    """Picks the largest Argon2 time cost whose hash time stays under `target_ms` on this machine."""
+    rounds = 1
+    while rounds < max_rounds:
+        context = CryptContext(
+            schemes=["argon2"],
+            argon2__rounds=rounds + 1,
+            argon2__memory_cost=memory_cost,
+            argon2__parallelism=parallelism,
+        )
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if elapsed_ms > target_ms:
+            break
+        rounds += 1
+
+    return {"rounds": rounds, "memory_cost": memory_cost, "parallelism": parallelism}
+
+
+def main(args):
+    params = calibrate_argon2(args.target_ms, args.memory_cost, args.parallelism)
+    print(f"ARGON2_ROUNDS={params['rounds']}")
+    print(f"ARGON2_MEMORY_COST={params['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={params['parallelism']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=int, default=250, help="longest acceptable time for one hash")
+    parser.add_argument("--memory-cost", type=int, default=65536, help="KiB of memory per hash")
+    parser.add_argument("--parallelism", type=int, default=4)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,288 @@
+"""
+Synthetic dataset generator for scale testing.
+
+Creates `--users` verified users sharing one password, a few custom categories each, and
+`--transactions` transactions spread unevenly between them, plus the matching daily rollups.
+Postgres is loaded with COPY, other databases with batched multi-row inserts. The same seed
+always produces the same data (apart from dates, which are relative to today).
+
+    python -m benchmarks.dataset --users 10000 --transactions 10000000
+    python -m benchmarks.dataset --database-url sqlite+aiosqlite:///scale.db --create-schema --users 100 --transactions 100000
+
+Run it against a migrated database with global categories seeded; users `<prefix><n>@example.com`
+must not exist yet.
+"""
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from src.auth.models import User
+from src.auth.utils import get_password_hash
+from src.categories.models import Category
+from src.database import Base
+from src.statistics.models import DailyRollup
+from src.statistics.utils import rollup_day
+from src.transactions.models import Transaction
+
+# Mirrors the seed_categories migration, for databases created with --create-schema.
+GLOBAL_CATEGORIES = [
+    {"name": "Продукти", "color": "#FF5733", "icon": "🍔"},
+    {"name": "Транспорт", "color": "#3498DB", "icon": "🚌"},
+    {"name": "Житло", "color": "#9B59B6", "icon": "🏠"},
+    {"name": "Кафе", "color": "#F1C40F", "icon": "☕"},
+    {"name": "Розваги", "color": "#E74C3C", "icon": "🎬"},
+    {"name": "Здоров’я", "color": "#2ECC71", "icon": "💊"},
+    {"name": "Зарплата", "color": "#27AE60", "icon": "💰"},
+]
+INCOME_CATEGORY = "Зарплата"
+
+# name -> (share of expense rows, median amount, transaction names)
+EXPENSE_PROFILE = {
+    "Продукти": (0.35, 350, ["АТБ", "Сільпо", "Novus", "Ринок"]),
+    "Транспорт": (0.20, 40, ["Метро", "Bolt", "Uklon", "Пальне"]),
+    "Житло": (0.03, 9000, ["Оренда", "Комуналка", "Інтернет"]),
+    "Кафе": (0.22, 180, ["Кава", "Обід", "Піца", "Доставка"]),
+    "Розваги": (0.10, 400, ["Кіно", "Концерт", "Steam", "Netflix"]),
+    "Здоров’я": (0.05, 600, ["Аптека", "Лікар", "Стоматолог"]),
+}
+CUSTOM_CATEGORIES = ["Подарунки", "Освіта", "Спорт", "Тварини", "Подорожі", "Одяг", "Діти", "Авто"]
+CUSTOM_SHARE = 0.05
+CUSTOM_MEDIAN = 500
+MAX_CUSTOM_CATEGORIES = 4
+SIDE_INCOME_SHARE = 0.03
+
+TRANSACTION_COLUMNS = ("user_id", "category_id", "type", "name", "amount", "date")
+ROLLUP_COLUMNS = ("user_id", "category_id", "day", "type", "total", "count")
+
+
+def split_transactions(rng: random.Random, users: int, transactions: int) -> list[int]:
+    """Long-tailed activity: a few heavy users and many light ones, summing to `transactions`."""
+    weights = [rng.lognormvariate(0, 1) for _ in range(users)]
+    scale = transactions / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+
+    for i in rng.sample(range(users), transactions - sum(counts)):
+        counts[i] += 1
+    return counts
+
+
+def random_date(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    # Squaring pulls dates towards `end`: users log more as they get used to the app.
+    offset = (end - start).total_seconds() * (1 - rng.random() ** 2)
+    moment = start + timedelta(seconds=offset)
+    hour = min(23, max(7, round(rng.gauss(15, 4))))
+    return moment.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+
+
+def user_transactions(
+        rng: random.Random,
+        user_id: int,
+        count: int,
+        categories: dict[str, int],
+        custom_ids: list[int],
+        now: datetime,
+        days: int,
+) -> list[tuple]:
+    """Rows in `TRANSACTION_COLUMNS` order: expenses by category profile, then monthly salaries."""
+    if not count:
+        return []
+
+    start = now - timedelta(days=rng.randint(min(30, days), days))
+    months = max(1, math.ceil((now - start).days / 30))
+    salaries = min(months, max(1, count // 10))
+    side_incomes = int((count - salaries) * SIDE_INCOME_SHARE)
+    expenses = count - salaries - side_incomes
+
+    names = list(EXPENSE_PROFILE)
+    weights = [EXPENSE_PROFILE[name][0] for name in names]
+    if custom_ids:
+        names.append(None)
+        weights.append(CUSTOM_SHARE)
+
+    rows = []
+    spent = 0.0
+    for name in rng.choices(names, weights, k=expenses):
+        if name is None:
+            category_id, median, label = rng.choice(custom_ids), CUSTOM_MEDIAN, "Інше"
+        else:
+            _, median, labels = EXPENSE_PROFILE[name]
+            category_id, label = categories.get(name), rng.choice(labels)
+
+        amount = round(median * rng.lognormvariate(0, 0.6), 2)
+        spent += amount
+        rows.append((user_id, category_id, "expense", label, amount, random_date(rng, start, now)))
+
+    income_category_id = categories.get(INCOME_CATEGORY)
+    for _ in range(side_incomes):
+        amount = round(2000 * rng.lognormvariate(0, 0.8), 2)
+        rows.append((user_id, income_category_id, "income", "Фріланс", amount, random_date(rng, start, now)))
+
+    # Salaries cover expenses at a per-user savings rate between -10% and 30%.
+    salary = round(max(spent, 1000.0) / rng.uniform(0.7, 1.1) / salaries, 2)
+    payday = rng.randint(1, 28)
+    for month in range(salaries):
+        day = (now - timedelta(days=30 * month)).replace(day=payday, hour=10, minute=0, second=0, microsecond=0)
+        rows.append((user_id, income_category_id, "income", "Зарплата", salary, min(day, now)))
+
+    return rows
+
+
+def rollup_rows(transactions: list[tuple]) -> list[tuple]:
+    totals: dict[tuple, list] = defaultdict(lambda: [0.0, 0])
+    for user_id, category_id, type, _, amount, date in transactions:
+        total = totals[(user_id, category_id, rollup_day(date), type)]
+        total[0] += amount
+        total[1] += 1
+
+    return [(*key, round(total, 2), count) for key, (total, count) in totals.items()]
+
+
+async def load_rows(conn: AsyncConnection, table, columns: tuple[str, ...], rows: list[tuple]):
+    if not rows:
+        return
+
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=columns)
+    else:
+        await conn.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+async def global_categories(conn: AsyncConnection, create: bool) -> dict[str, int]:
+    result = await conn.execute(select(Category.name, Category.id).where(Category.user_id.is_(None)))
+    categories = dict(result.all())
+
+    if not categories and create:
+        await conn.execute(insert(Category), [{**category, "user_id": None} for category in GLOBAL_CATEGORIES])
+        return await global_categories(conn, create=False)
+
+    if not categories:
+        raise RuntimeError("No global categories found; run the migrations or pass --create-schema")
+    return categories
+
+
+async def generate(
+        engine: AsyncEngine,
+        users: int,
+        transactions: int,
+        *,
+        days: int = 1095,
+        seed: int = 42,
+        password: str = "password",
+        email_prefix: str = "user",
+        create_schema: bool = False,
+        batch_size: int = 50_000,
+        users_per_commit: int = 500,
+) -> list[str]:
+    """Loads the dataset and returns the generated emails."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password_hash = await get_password_hash(password)
+    emails = [f"{email_prefix}{i}@example.com" for i in range(users)]
+    counts = split_transactions(rng, users, transactions)
+
+    async with engine.begin() as conn:
+        if create_schema:
+            await conn.run_sync(Base.metadata.create_all)
+        categories = await global_categories(conn, create=create_schema)
+
+    started = time.perf_counter()
+    loaded = 0
+    for first in range(0, users, users_per_commit):
+        chunk = range(first, min(first + users_per_commit, users))
+
+        async with engine.begin() as conn:
+            user_ids = list((await conn.execute(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                [{"email": emails[i], "password": password_hash, "is_verified": True,
+                  "created_at": now.replace(tzinfo=None)} for i in chunk],
+            )).scalars())
+
+            custom = [
+                (user_id, rng.sample(CUSTOM_CATEGORIES, rng.randint(0, MAX_CUSTOM_CATEGORIES)))
+                for user_id in user_ids
+            ]
+            custom_rows = [
+                {"user_id": user_id, "name": name, "color": f"#{rng.randrange(0x1000000):06X}", "icon": "📦"}
+                for user_id, names in custom for name in names
+            ]
+            custom_ids: dict[int, list[int]] = defaultdict(list)
+            if custom_rows:
+                result = await conn.execute(
+                    insert(Category).returning(Category.user_id, Category.id, sort_by_parameter_order=True),
+                    custom_rows,
+                )
+                for user_id, category_id in result.all():
+                    custom_ids[user_id].append(category_id)
+
+            pending, rollups = [], []
+            for i, user_id in zip(chunk, user_ids):
+                rows = user_transactions(rng, user_id, counts[i], categories, custom_ids[user_id], now, days)
+                pending.extend(rows)
+                rollups.extend(rollup_rows(rows))
+
+                if len(pending) >= batch_size:
+                    await load_rows(conn, Transaction.__table__, TRANSACTION_COLUMNS, pending)
+                    loaded += len(pending)
+                    pending = []
+
+            await load_rows(conn, Transaction.__table__, TRANSACTION_COLUMNS, pending)
+            await load_rows(conn, DailyRollup.__table__, ROLLUP_COLUMNS, rollups)
+            loaded += len(pending)
+
+        elapsed = time.perf_counter() - started
+        print(f"users {chunk.stop}/{users}, transactions {loaded}/{transactions}, {loaded / elapsed:,.0f} rows/s",
+              file=sys.stderr)
+
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.execute(text("ANALYZE users, categories, transactions, daily_rollups"))
+
+    return emails
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    try:
+        await generate(
+            engine,
+            args.users,
+            args.transactions,
+            days=args.days,
+            seed=args.seed,
+            password=args.password,
+            email_prefix=args.email_prefix,
+            create_schema=args.create_schema,
+            batch_size=args.batch_size,
+        )
+    finally:
+        await engine.dispose()
+
+
+def parse_args(argv=None):
+    from src.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--transactions", type=int, default=10_000_000, help="total across all users")
+    parser.add_argument("--days", type=int, default=1095, help="oldest account age in days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password", help="password of every generated user")
+    parser.add_argument("--email-prefix", default="user")
+    parser.add_argument("--create-schema", action="store_true",
+                        help="create tables and global categories instead of relying on migrations")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="transactions per COPY/INSERT")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
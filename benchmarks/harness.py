@@ -0,0 +1,111 @@
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(
+        name: str,
+        send: Callable[[int], Awaitable[httpx.Response]],
+        requests: int,
+        concurrency: int,
+) -> ScenarioResult:
+    """Calls `send(i)` for i in range(requests), at most `concurrency` at a time."""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await send(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        errors=errors,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        throughput_rps=round(requests / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+def print_results(results: list[ScenarioResult]):
+    header = f"{'scenario':<24}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.name:<24}{result.requests:>7}{result.errors:>8}"
+            f"{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}{result.p99_ms:>10.2f}{result.throughput_rps:>10.1f}"
+        )
+
+
+def save_baseline(path: str, results: list[ScenarioResult], meta: dict):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"meta": meta, "results": [asdict(result) for result in results]}, file, indent=2)
+
+
+def compare_with_baseline(path: str, results: list[ScenarioResult], max_regression: float) -> bool:
+    """Prints the change against a saved baseline. Returns False if any p95 got worse by more than `max_regression` %."""
+    with open(path, encoding="utf-8") as file:
+        baseline = {result["name"]: result for result in json.load(file)["results"]}
+
+    ok = True
+    print(f"\n{'scenario':<24}{'p50 Δ%':>10}{'p95 Δ%':>10}{'p99 Δ%':>10}{'rps Δ%':>10}")
+    for result in results:
+        old = baseline.get(result.name)
+        if not old:
+            print(f"{result.name:<24}{'new':>10}")
+            continue
+
+        def delta(key: str) -> float:
+            return (getattr(result, key) - old[key]) / old[key] * 100 if old[key] else 0.0
+
+        p95_delta = delta("p95_ms")
+        marker = ""
+        if p95_delta > max_regression:
+            ok = False
+            marker = "  REGRESSION"
+
+        print(
+            f"{result.name:<24}{delta('p50_ms'):>+10.1f}{p95_delta:>+10.1f}"
+            f"{delta('p99_ms'):>+10.1f}{delta('throughput_rps'):>+10.1f}{marker}"
+        )
+
+    return ok
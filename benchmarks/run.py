@@ -0,0 +1,258 @@
+"""
+Latency/throughput benchmark for the main API endpoints.
+
+In-process (default): builds a fresh database from `--database-url`, seeds it and drives
+`src.main.app` through httpx's ASGITransport, so no server, broker or Redis is required.
+
+    python -m benchmarks.run --users 5 --transactions 20000 --save results.json
+    python -m benchmarks.run --users 5 --transactions 20000 --compare results.json
+
+Against a running server: pass `--base-url` and the credentials of an existing verified user.
+`--transactions` rows are added through POST /transactions/batch first; pass 0 to reuse existing data.
+
+    python -m benchmarks.run --base-url http://localhost:8000 --email me@example.com --password secret
+"""
+import argparse
+import asyncio
+import platform
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks.harness import ScenarioResult, compare_with_baseline, print_results, run_scenario, save_baseline
+
+PASSWORD = "benchmark-password"
+BATCH_SIZE = 500
+
+
+class MemoryRedis:
+    """The subset of redis.asyncio used by the app, kept in a dict for in-process runs without Redis."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def getdel(self, key):
+        return self.store.pop(key, None)
+
+    async def setex(self, name, time, value):
+        self.store[name] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def exists(self, *keys):
+        return sum(key in self.store for key in keys)
+
+    async def ttl(self, key):
+        return -1 if key in self.store else -2
+
+
+def random_transaction(rng: random.Random, category_ids: list[int], income_category_id: int, days: int) -> dict:
+    is_income = rng.random() < 0.1
+    return {
+        "type": "income" if is_income else "expense",
+        "name": "Salary" if is_income else rng.choice(["Coffee", "Groceries", "Taxi", "Rent", "Cinema", "Pharmacy"]),
+        "amount": round(rng.uniform(1000, 30000) if is_income else rng.uniform(20, 2000), 2),
+        "category_id": income_category_id if is_income else rng.choice(category_ids),
+        "date": datetime.now(timezone.utc) - timedelta(days=rng.uniform(0, days)),
+    }
+
+
+async def seed_database(database_url: str, users: int, transactions: int, days: int, seed: int) -> list[str]:
+    """Recreates the schema and loads a synthetic dataset with about `transactions` rows per user."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from benchmarks.dataset import generate
+    from src.database import Base
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    try:
+        return await generate(
+            engine, users, users * transactions,
+            days=days, seed=seed, password=PASSWORD, email_prefix="bench", create_schema=True,
+        )
+    finally:
+        await engine.dispose()
+
+
+async def seed_remote(client: httpx.AsyncClient, headers: dict, transactions: int, days: int, seed: int):
+    categories = (await client.get("/categories/", headers=headers)).json()
+    category_ids = [category["id"] for category in categories]
+    income_category_id = next((c["id"] for c in categories if c["name"] == "Зарплата"), category_ids[-1])
+
+    rng = random.Random(seed)
+    remaining = transactions
+    while remaining:
+        items = [random_transaction(rng, category_ids, income_category_id, days) for _ in range(min(BATCH_SIZE, remaining))]
+        remaining -= len(items)
+        for item in items:
+            item["date"] = item["date"].isoformat()
+        response = await client.post("/transactions/batch", json={"items": items}, headers=headers)
+        response.raise_for_status()
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_benchmarks(client: httpx.AsyncClient, args, emails: list[str], password: str) -> list[ScenarioResult]:
+    headers = [await login(client, email, password) for email in emails]
+    if args.base_url and args.transactions:
+        await seed_remote(client, headers[0], args.transactions, args.days, args.seed)
+
+    def auth(i: int) -> dict:
+        return headers[i % len(headers)]
+
+    page = (await client.get("/transactions/cursor", params={"size": 100}, headers=headers[0])).json()
+    owned = [(item["id"], item["type"]) for item in page["items"]] or [(0, "expense")]
+    category_id = (await client.get("/categories/", headers=headers[0])).json()[0]["id"]
+
+    today = date.today()
+    year_ago = (today - timedelta(days=365)).isoformat()
+    requests, login_requests = args.requests, max(1, args.requests // 10)
+
+    scenarios = [
+        ("login", login_requests, lambda i: client.post(
+            "/auth/login", json={"email": emails[i % len(emails)], "password": password})),
+        ("transactions.list", requests, lambda i: client.get(
+            "/transactions/", params={"page": i % 5 + 1, "size": 50}, headers=auth(i))),
+        ("transactions.cursor", requests, lambda i: client.get(
+            "/transactions/cursor", params={"size": 50}, headers=auth(i))),
+        ("transactions.create", requests, lambda i: client.post("/transactions/", headers=headers[0], json={
+            "type": "expense", "name": "Benchmark", "amount": "12.50",
+            "category_id": category_id, "date": datetime.now(timezone.utc).isoformat(),
+        })),
+        ("transactions.update", requests, lambda i: client.patch(
+            f"/transactions/{owned[i % len(owned)][0]}",
+            json={"type": owned[i % len(owned)][1], "amount": f"{10 + i % 100}.00"}, headers=headers[0])),
+        ("statistics.dashboard", requests, lambda i: client.get("/statistics/dashboard", headers=auth(i))),
+        ("statistics.categories", requests, lambda i: client.get(
+            "/statistics/categories", params={"start_date": year_ago, "end_date": today.isoformat()}, headers=auth(i))),
+        ("statistics.history", requests, lambda i: client.get(
+            "/statistics/history", params={"start_date": year_ago, "granularity": "month"}, headers=auth(i))),
+    ]
+
+    results = []
+    for name, count, send in scenarios:
+        if args.only and name not in args.only:
+            continue
+        for i in range(args.warmup):
+            await send(i)
+        results.append(await run_scenario(name, send, count, args.concurrency))
+    return results
+
+
+async def main(args) -> bool:
+    if args.base_url:
+        if not args.email or not args.password:
+            sys.exit("--base-url requires --email and --password of an existing verified user")
+
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+            results = await run_benchmarks(client, args, [args.email], args.password)
+    else:
+        emails = await seed_database(args.database_url, args.users, args.transactions, args.days, args.seed)
+        results = await run_in_process(args, emails)
+
+    print_results(results)
+
+    meta = {
+        "target": args.base_url or args.database_url,
+        "users": args.users,
+        "transactions_per_user": args.transactions,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if args.save:
+        save_baseline(args.save, results, meta)
+    if args.compare:
+        return compare_with_baseline(args.compare, results, args.max_regression)
+    return True
+
+
+async def run_in_process(args, emails: list[str]) -> list[ScenarioResult]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from src.config import settings
+    from src.database import get_session
+    from src.main import app
+    from src.redis_utils import get_redis_client
+
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    if args.redis_url:
+        from src.redis_utils import InstrumentedRedis
+        redis_client = InstrumentedRedis.from_url(args.redis_url, encoding="utf-8", decode_responses=True)
+    else:
+        redis_client = MemoryRedis()
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    async def override_get_redis():
+        return redis_client
+
+    # Limits are per client IP, and every in-process request comes from the same one.
+    settings.RATE_LIMIT_ENABLED = False
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_redis_client] = override_get_redis
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+            return await run_benchmarks(client, args, emails, PASSWORD)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--email", help="existing verified user for --base-url")
+    parser.add_argument("--password", help="password of --email")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///benchmark.db",
+                        help="database to create and seed for in-process runs (it is dropped first)")
+    parser.add_argument("--redis-url", help="use a real Redis for in-process runs instead of an in-memory stand-in")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=5000, help="transactions per user (on average for in-process runs)")
+    parser.add_argument("--days", type=int, default=730, help="spread transactions over this many past days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario (login uses a tenth)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a JSON file written by --save")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="exit with 1 when a scenario's p95 is this many percent slower than --compare")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main(parse_args())) else 1)
@@ -0,0 +1,166 @@
+"""
+Compares the column/orjson response path with the ORM/Pydantic one it replaced.
+
+For each list endpoint both variants run the query, build the payload and encode it to JSON bytes,
+against the same database and session, so the difference is the cost of ORM loading,
+`from_attributes` validation and response model serialization.
+
+    python -m benchmarks.serialization --transactions 20000 --page-size 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from benchmarks.dataset import generate
+from benchmarks.harness import percentile
+from src.categories.models import Category
+from src.categories.routes import _category_json
+from src.categories.schemas import CategoryRead
+from src.database import Base
+from src.responses import FastJSONResponse
+from src.statistics.models import DailyRollup
+from src.statistics.schemas import CategoryStat
+from src.transactions.models import Transaction
+from src.transactions.routes import LIST_COLUMNS, _transaction_json
+from src.transactions.schemas import TransactionOut
+
+encode = FastJSONResponse(None).render
+
+
+async def orm_transactions(session: AsyncSession, user_id: int, size: int) -> bytes:
+    result = await session.execute(
+        select(Transaction)
+        .options(joinedload(Transaction.category))
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(size)
+    )
+    adapter = TypeAdapter(list[TransactionOut])
+    return adapter.dump_json(adapter.validate_python(result.scalars().all(), from_attributes=True))
+
+async def fast_transactions(session: AsyncSession, user_id: int, size: int) -> bytes:
+    result = await session.execute(
+        select(*LIST_COLUMNS)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(size)
+    )
+    return encode([_transaction_json(row) for row in result.all()])
+
+
+def _categories_query(user_id: int, *columns):
+    return select(*columns).where((Category.user_id == None) | (Category.user_id == user_id)).order_by(Category.id)
+
+async def orm_categories(session: AsyncSession, user_id: int, size: int) -> bytes:
+    result = await session.execute(_categories_query(user_id, Category))
+    adapter = TypeAdapter(list[CategoryRead])
+    return adapter.dump_json(adapter.validate_python(result.scalars().all(), from_attributes=True))
+
+async def fast_categories(session: AsyncSession, user_id: int, size: int) -> bytes:
+    result = await session.execute(_categories_query(
+        user_id, Category.name, Category.color, Category.icon, Category.id, Category.user_id,
+    ))
+    return encode([_category_json(row) for row in result.all()])
+
+
+def _category_stats_query(user_id: int, *columns):
+    start = date.today() - timedelta(days=365)
+    return (
+        select(*columns, func.sum(DailyRollup.total).label("total"))
+        .join(Category, Category.id == DailyRollup.category_id)
+        .where(and_(DailyRollup.user_id == user_id, DailyRollup.day >= start, DailyRollup.type == "expense"))
+        .group_by(Category.id)
+    )
+
+async def orm_category_stats(session: AsyncSession, user_id: int, size: int) -> bytes:
+    rows = (await session.execute(_category_stats_query(user_id, Category))).all()
+    total_sum = sum(float(row[1]) for row in rows)
+    stats = [
+        CategoryStat(category=category, total_amount=float(amount), percentage=round(float(amount) / total_sum * 100, 1))
+        for category, amount in rows
+    ]
+    adapter = TypeAdapter(list[CategoryStat])
+    return adapter.dump_json(adapter.validate_python(stats))
+
+async def fast_category_stats(session: AsyncSession, user_id: int, size: int) -> bytes:
+    rows = (await session.execute(_category_stats_query(
+        user_id, Category.name, Category.color, Category.icon, Category.id, Category.user_id,
+    ))).all()
+    total_sum = sum(float(row.total) for row in rows)
+    return encode([
+        {
+            "category": _category_json(row),
+            "total_amount": float(row.total),
+            "percentage": round(float(row.total) / total_sum * 100, 1),
+        }
+        for row in rows
+    ])
+
+
+CASES = [
+    ("transactions", orm_transactions, fast_transactions),
+    ("categories", orm_categories, fast_categories),
+    ("statistics.categories", orm_category_stats, fast_category_stats),
+]
+
+
+async def measure(session_factory, handler, user_id: int, size: int, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        # A fresh session per call, as in a request, so the ORM variant pays for populating the identity map.
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await handler(session, user_id, size)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await generate(engine, 1, args.transactions, seed=args.seed, email_prefix="serialization", create_schema=True)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        user_id = await session.scalar(select(func.min(Transaction.user_id)))
+        for _, orm, fast in CASES:
+            assert (await orm(session, user_id, args.page_size)) == (await fast(session, user_id, args.page_size))
+
+    print(f"{'endpoint':<24}{'path':>6}{'mean ms':>10}{'p95 ms':>10}{'speedup':>10}")
+    for name, orm, fast in CASES:
+        results = {}
+        for label, handler in (("orm", orm), ("fast", fast)):
+            await measure(session_factory, handler, user_id, args.page_size, args.warmup)
+            results[label] = await measure(session_factory, handler, user_id, args.page_size, args.iterations)
+
+        baseline = statistics.fmean(results["orm"])
+        for label, timings in results.items():
+            mean = statistics.fmean(timings)
+            print(f"{name:<24}{label:>6}{mean:>10.3f}{percentile(timings, 95):>10.3f}{baseline / mean:>9.2f}x")
+
+    await engine.dispose()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///benchmark.db",
+                        help="database to create and seed (it is dropped first)")
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
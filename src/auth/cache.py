@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timezone
+
+from src.auth.models import User
+from src.auth.utils import decode_token
+from src.cache import TTLCache
+from src.config import settings
+
+_token_cache = TTLCache(ttl=settings.USER_LOCAL_CACHE_TTL)
+_user_cache = TTLCache(ttl=settings.USER_LOCAL_CACHE_TTL)
+
+
+USER_KEY_PREFIX = "user:"
+
+
+def _user_key(user_id: int) -> str:
+    return f"{USER_KEY_PREFIX}{user_id}"
+
+def version_key(user_id: int) -> str:
+    return f"user_version:{user_id}"
+
+def decode_token_cached(token: str) -> dict:
+    payload = _token_cache.get(token)
+
+    if payload is None:
+        payload = decode_token(token)
+
+        expire = payload.get("exp")
+        if expire:
+            ttl = min(settings.USER_LOCAL_CACHE_TTL, int(expire) - datetime.now(timezone.utc).timestamp())
+            if ttl > 0:
+                _token_cache.set(token, payload, ttl=ttl)
+
+    return payload
+
+def _serialize_user(user: User) -> dict:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "is_verified": user.is_verified,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
+def _deserialize_user(data: dict) -> User:
+    created_at = data.get("created_at")
+    return User(
+        id=data["id"],
+        email=data["email"],
+        is_verified=data["is_verified"],
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+    )
+
+async def get_cached_user(user_id: int, redis_client) -> tuple[User | None, str]:
+    """
+    Returns the cached user (if still valid) and the current version of the user's entry.
+
+    Copies are tagged with the version they were read at and only used while it matches the one
+    in Redis, so `invalidate_user` reaches every worker. A local hit costs a GET of the version
+    instead of the whole entry; a miss reads both in one round trip.
+    """
+    cached = _user_cache.get(user_id)
+
+    if cached is not None:
+        version = await redis_client.get(version_key(user_id)) or "0"
+        if cached[0] == version:
+            return _deserialize_user(cached[1]), version
+        raw = await redis_client.get(_user_key(user_id))
+    else:
+        version, raw = await redis_client.mget(version_key(user_id), _user_key(user_id))
+        version = version or "0"
+
+    if raw is None:
+        return None, version
+
+    data = json.loads(raw)
+    # An entry written by a request that read the user before the last invalidation.
+    if data.get("version") != version:
+        return None, version
+
+    _user_cache.set(user_id, (version, data))
+    return _deserialize_user(data), version
+
+def load_cached_user(raw: str) -> User:
+    """User from a Redis entry written by `cache_user` that was fetched some other way, e.g. by a script."""
+    return _deserialize_user(json.loads(raw))
+
+async def cache_user(user: User, version: str, redis_client) -> None:
+    """`version` is the one `get_cached_user` returned before the user was loaded."""
+    data = {**_serialize_user(user), "version": version}
+    _user_cache.set(user.id, (version, data))
+    await redis_client.set(_user_key(user.id), json.dumps(data), ex=settings.USER_CACHE_TTL)
+
+async def invalidate_user(user_id: int, redis_client) -> None:
+    _user_cache.pop(user_id)
+    await redis_client.incr(version_key(user_id))
+    await redis_client.delete(_user_key(user_id))
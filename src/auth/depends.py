@@ -5,9 +5,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth.cache import cache_user, decode_token_cached, get_cached_user
 from src.auth.models import User
-from src.auth.utils import decode_token
 from src.database import get_session
+from src.redis_utils import get_redis_client
 
 
 security = HTTPBearer()
@@ -17,8 +18,8 @@ async def get_token(credentials: HTTPAuthorizationCredentials = Depends(security
     return credentials.credentials
 
 
-async def read_user(token: str = Depends(get_token), session: AsyncSession = Depends(get_session)) -> User:
-    payload = decode_token(token)
+async def read_user(token: str = Depends(get_token), session: AsyncSession = Depends(get_session), redis_client = Depends(get_redis_client)) -> User:
+    payload = decode_token_cached(token)
 
     expire = payload.get("exp")
     expire_time = datetime.fromtimestamp(int(expire), tz=timezone.utc)
@@ -36,6 +37,10 @@ async def read_user(token: str = Depends(get_token), session: AsyncSession = Dep
             detail="Username not found",
         )
 
+    user, version = await get_cached_user(int(user_id), redis_client)
+    if user:
+        return user
+
     result = await session.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
 
@@ -45,4 +50,6 @@ async def read_user(token: str = Depends(get_token), session: AsyncSession = Dep
             detail="User not found",
         )
 
+    await cache_user(user, version, redis_client)
+
     return user
\ No newline at end of file
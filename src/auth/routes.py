@@ -6,15 +6,20 @@ import secrets
 
 from src.auth.models import User
 from src.auth.schemas import UserRegister, UserLogin, AuthResponse, Token, VerifyEmail, UserEmail, ForgotPasswordRequest, ResetPasswordRequest
-from src.auth.utils import get_password_hash, verify_password, create_access_token, create_refresh_token, get_token_hash
+from src.auth.cache import invalidate_user, load_cached_user
+from src.auth.scripts import PASSWORD_RESET_TTL, VERIFICATION_CODE_TTL, consume_password_reset_token, consume_verification_code, password_reset_key, read_refresh_token, store_resent_code, verification_key
+from src.auth.utils import get_password_hash, verify_and_update_password, create_access_token, create_refresh_token, get_token_hash, refresh_token_key
 from src.database import get_session
 from src.redis_utils import get_redis_client
-from src.worker import broker
+from src.outbox.relay import add_message, relay
+from src.rate_limit import rate_limit
+from src.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authorization"])
 
 @router.post("/register", status_code=status.HTTP_201_CREATED,
     summary="Register new user",
+    dependencies=[Depends(rate_limit("register", ip=settings.RATE_LIMIT_REGISTER_IP))],
     responses={
         status.HTTP_409_CONFLICT: {"description": "User is already exist"}
 })
@@ -32,26 +37,22 @@ async def register_user(payload: UserRegister, session: AsyncSession = Depends(g
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User is already exist")
     
     payload_dict = payload.model_dump()
-    payload_dict["password"] = get_password_hash(payload.password)
-
-    new_user = User(**payload_dict)
-    session.add(new_user)
-    await session.commit()
-    await session.refresh(new_user)
+    payload_dict["password"] = await get_password_hash(payload.password)
 
     verification_code = str(randint(100000, 999999))
-    redis_key = f"verification:{new_user.email}"
+    await redis_client.set(verification_key(payload.email), verification_code, ex=VERIFICATION_CODE_TTL)
 
-    await redis_client.set(redis_key, verification_code, ex=300)
-    message_body = {
-        "email": new_user.email,
-        "code": verification_code
-    }
+    # The email is sent by the outbox relay, and only if the user row is committed.
+    session.add(User(**payload_dict))
+    add_message(session, {"email": payload.email, "code": verification_code}, queue="verification")
+    await session.commit()
+    relay.wake()
 
-    await broker.publish(message_body, queue="verification")
     return {"message": "User created successfully"}
 
-@router.post("/login", response_model=AuthResponse, summary="", responses={
+@router.post("/login", response_model=AuthResponse, summary="", dependencies=[
+    Depends(rate_limit("login", ip=settings.RATE_LIMIT_LOGIN_IP, email=settings.RATE_LIMIT_LOGIN_EMAIL)),
+], responses={
     status.HTTP_401_UNAUTHORIZED: {"description": "Invalid credentials"}
 })
 async def auth_user(payload: UserLogin, response: Response, session: AsyncSession = Depends(get_session), redis_client = Depends(get_redis_client)) -> Token:
@@ -65,9 +66,18 @@ async def auth_user(payload: UserLogin, response: Response, session: AsyncSessio
     result = await session.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.password):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    is_valid, new_hash = await verify_and_update_password(payload.password, user.password)
+
+    if not is_valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    if new_hash:
+        user.password = new_hash
+        await session.commit()
+
     if not user.is_verified:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -87,37 +97,24 @@ async def resend_verification_code(payload: UserEmail, session: AsyncSession = D
     if user.is_verified:
         raise HTTPException(status_code=400, detail="Email is already verified")
 
-    spam_key = f"spam_block:{user.email}"
-    if await redis_client.exists(spam_key):
-        ttl = await redis_client.ttl(spam_key)
+    new_code = str(randint(100000, 999999))
+
+    ttl = await store_resent_code(user.email, new_code, redis_client)
+    if ttl:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Please wait {ttl} seconds before requesting a new code"
         )
 
-    new_code = str(randint(100000, 999999))
-    verification_key = f"verification:{user.email}"
-
-    await redis_client.set(verification_key, new_code, ex=300)
-
-    await redis_client.set(spam_key, "1", ex=60)
-
-    message = {
-        "email": user.email,
-        "code": new_code
-    }
-
-    await broker.publish(message, queue="verification")
+    add_message(session, {"email": user.email, "code": new_code}, queue="verification")
+    await session.commit()
+    relay.wake()
 
     return {"message": "Verification code sent"}
 
 @router.post("/verify")
 async def verify_email(payload: VerifyEmail, response: Response, session: AsyncSession = Depends(get_session), redis_client = Depends(get_redis_client)):
-    redis_key = f"verification:{payload.email}"
-    stored_code = await redis_client.get(redis_key)
-    print(stored_code, payload.code)
-
-    if not stored_code or stored_code != payload.code:
+    if not await consume_verification_code(payload.email, payload.code, redis_client):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired code")
 
     # 2. Отримання користувача
@@ -135,7 +132,7 @@ async def verify_email(payload: VerifyEmail, response: Response, session: AsyncS
     await session.commit()
     await session.refresh(user)
 
-    await redis_client.delete(redis_key)
+    await invalidate_user(user.id, redis_client)
 
     return await _generate_auth_response(user, response, redis_client)
 
@@ -162,19 +159,22 @@ async def update_refresh_token(request: Request, session: AsyncSession = Depends
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token is missing")
     
-    hash_token = get_token_hash(refresh_token)  
-    redis_key = f"refresh_token:{hash_token}"
+    hash_token = get_token_hash(refresh_token)
+
+    user_id, cached_user = await read_refresh_token(hash_token, redis_client)
 
-    user_id = await redis_client.get(redis_key)
-    
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
-    
-    user_query = await session.execute(select(User).where(User.id == int(user_id)))
-    user_data = user_query.scalar_one_or_none()
-    
+
+    # The user is cached while they are active, so a refresh usually needs no query.
+    if cached_user:
+        user_data = load_cached_user(cached_user)
+    else:
+        user_query = await session.execute(select(User).where(User.id == int(user_id)))
+        user_data = user_query.scalar_one_or_none()
+
     if not user_data:
-        await redis_client.delete(redis_key)
+        await redis_client.delete(refresh_token_key(hash_token))
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
     # logger.info(f"Refresh token used and deleted for user {user_id}")
@@ -184,7 +184,9 @@ async def update_refresh_token(request: Request, session: AsyncSession = Depends
     return Token(access_token=access_token, token_type="bearer")
 
 
-@router.post("/forgot", status_code=status.HTTP_202_ACCEPTED)
+@router.post("/forgot", status_code=status.HTTP_202_ACCEPTED, dependencies=[
+    Depends(rate_limit("forgot", ip=settings.RATE_LIMIT_FORGOT_IP, email=settings.RATE_LIMIT_FORGOT_EMAIL)),
+])
 async def forgot_password(
         payload: ForgotPasswordRequest,
         session: AsyncSession = Depends(get_session),
@@ -196,24 +198,17 @@ async def forgot_password(
     if user:
         token = secrets.token_urlsafe(32)
 
-        redis_key = f"pwd_reset:{token}"
-        await redis.set(redis_key, user.email, ex=900)
+        await redis.set(password_reset_key(token), user.email, ex=PASSWORD_RESET_TTL)
 
-        await broker.publish(
-            {
-                "email": user.email,
-                "token": token
-            },
-            queue="verification"
-        )
+        add_message(session, {"email": user.email, "token": token}, queue="verification")
+        await session.commit()
+        relay.wake()
 
     return {"message": "If this email exists, verification link has been sent."}
 
 @router.post("/reset", status_code=status.HTTP_200_OK)
 async def reset_password(payload: ResetPasswordRequest, session: AsyncSession = Depends(get_session), redis = Depends(get_redis_client)):
-    redis_key = f"pwd_reset:{payload.token}"
-
-    email = await redis.get(redis_key)
+    email = await consume_password_reset_token(payload.token, redis)
 
     if not email:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
@@ -224,11 +219,11 @@ async def reset_password(payload: ResetPasswordRequest, session: AsyncSession =
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.password = get_password_hash(payload.new_password)
+    user.password = await get_password_hash(payload.new_password)
     session.add(user)
     await session.commit()
 
-    await redis.delete(redis_key)
+    await invalidate_user(user.id, redis)
 
     return {"message": "Password updated successfully"}
 
@@ -244,9 +239,7 @@ async def logout_user(request: Request, response: Response, redis_client = Depen
     refresh_token = request.cookies.get("user_refresh_token")
 
     if refresh_token:
-        hash_token = get_token_hash(refresh_token)
-        redis_key = f"refresh_token:{hash_token}"
-        await redis_client.delete(redis_key)
+        await redis_client.delete(refresh_token_key(get_token_hash(refresh_token)))
 
     response.delete_cookie(
         key="user_refresh_token",
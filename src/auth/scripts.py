@@ -0,0 +1,69 @@
+"""Auth steps that each take one atomic Redis round trip."""
+from src.auth.cache import USER_KEY_PREFIX
+from src.auth.utils import refresh_token_key
+from src.redis_utils import LuaScript
+
+VERIFICATION_CODE_TTL = 300
+RESEND_BLOCK_TTL = 60
+PASSWORD_RESET_TTL = 900
+
+# Returns the seconds left on the resend block, or 0 after storing the new code and starting the block.
+RESEND_CODE = LuaScript("""
+local wait = redis.call('TTL', KEYS[1])
+if wait > 0 then
+    return wait
+end
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+redis.call('SET', KEYS[1], '1', 'EX', ARGV[3])
+return 0
+""")
+
+# Deletes the code only if it matches, so it can be used once even by concurrent requests.
+CONSUME_CODE = LuaScript("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+return 0
+""")
+
+# The user id a refresh token belongs to, plus that user's cache entry when there is one.
+READ_REFRESH_TOKEN = LuaScript("""
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return {}
+end
+return {user_id, redis.call('GET', ARGV[1] .. user_id)}
+""")
+
+
+def verification_key(email: str) -> str:
+    return f"verification:{email}"
+
+def resend_block_key(email: str) -> str:
+    return f"spam_block:{email}"
+
+def password_reset_key(token: str) -> str:
+    return f"pwd_reset:{token}"
+
+async def store_resent_code(email: str, code: str, redis_client) -> int:
+    """Stores a new verification code unless one was sent recently. Returns the seconds to wait, 0 if stored."""
+    return int(await RESEND_CODE(
+        redis_client,
+        [resend_block_key(email), verification_key(email)],
+        [code, VERIFICATION_CODE_TTL, RESEND_BLOCK_TTL],
+    ))
+
+async def consume_verification_code(email: str, code: str, redis_client) -> bool:
+    return bool(await CONSUME_CODE(redis_client, [verification_key(email)], [code]))
+
+async def read_refresh_token(token_hash: str, redis_client) -> tuple[str | None, str | None]:
+    """Returns `(user_id, cached_user)`; both are None for an unknown or expired token."""
+    values = await READ_REFRESH_TOKEN(redis_client, [refresh_token_key(token_hash)], [USER_KEY_PREFIX])
+    if not values:
+        return None, None
+    return values[0], values[1] if len(values) > 1 else None
+
+async def consume_password_reset_token(token: str, redis_client) -> str | None:
+    """Returns the email the token was issued for and deletes it in the same command, so it works once."""
+    return await redis_client.getdel(password_reset_key(token))
@@ -1,16 +1,42 @@
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status
 from src.config import settings
-import uuid, jwt, hashlib
+import asyncio, uuid, jwt, hashlib
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# argon2-cffi releases the GIL, so a small thread pool is enough to keep hashing off the event loop.
+# The pool size is also the limit of concurrent hashes per worker, the rest wait in the queue.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def _run_in_hash_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, func, *args)
+
+async def get_password_hash(password: str) -> str:
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Returns `(is_valid, new_hash)`, where `new_hash` is set when the stored hash uses outdated parameters."""
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def configure_password_hashing():
+    """
+    Applies the Argon2 parameters from settings.
+
+    They are fixed rather than measured at startup: workers calibrating at the same time would pick
+    different costs and keep rehashing each other's hashes. Use `python -m benchmarks.argon2` to choose them.
+    """
+    pwd_context.update(
+        argon2__rounds=settings.ARGON2_ROUNDS,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -28,13 +54,16 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 def get_token_hash(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
+def refresh_token_key(token_hash: str) -> str:
+    return f"refresh_token:{token_hash}"
+
 async def create_refresh_token(user_id: int, redis_client) -> str:
     refresh_token = str(uuid.uuid4())
     hash_token = get_token_hash(refresh_token)
 
     expires_in_seconds = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
-    redis_key = f"refresh_token:{hash_token}"
+    redis_key = refresh_token_key(hash_token)
 
     await redis_client.setex(
         redis_key,
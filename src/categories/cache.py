@@ -0,0 +1,60 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import TTLCache
+from src.categories.models import Category
+from src.categories.schemas import CategoryRead
+from src.config import settings
+
+# Global categories are seeded by migrations and never change at runtime, so they are loaded once per worker.
+_global_categories: dict[int, CategoryRead] | None = None
+_user_categories = TTLCache(ttl=settings.CATEGORY_CACHE_TTL)
+
+
+def version_key(user_id: int) -> str:
+    return f"categories_version:{user_id}"
+
+async def load_global_categories(session: AsyncSession) -> dict[int, CategoryRead]:
+    global _global_categories
+
+    result = await session.execute(select(Category).where(Category.user_id.is_(None)))
+    _global_categories = {
+        category.id: CategoryRead.model_validate(category)
+        for category in result.scalars().all()
+    }
+    return _global_categories
+
+async def get_global_categories(session: AsyncSession) -> dict[int, CategoryRead]:
+    if _global_categories is None:
+        return await load_global_categories(session)
+    return _global_categories
+
+async def get_global_category_by_name(name: str, session: AsyncSession) -> CategoryRead | None:
+    categories = await get_global_categories(session)
+    return next((category for category in categories.values() if category.name == name), None)
+
+async def get_user_categories(user_id: int, session: AsyncSession, redis_client) -> dict[int, CategoryRead]:
+    version = await redis_client.get(version_key(user_id)) or "0"
+
+    cached = _user_categories.get(user_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    result = await session.execute(select(Category).where(Category.user_id == user_id))
+    categories = {
+        category.id: CategoryRead.model_validate(category)
+        for category in result.scalars().all()
+    }
+    _user_categories.set(user_id, (version, categories))
+
+    return categories
+
+async def get_available_categories(user_id: int, session: AsyncSession, redis_client) -> dict[int, CategoryRead]:
+    """Global categories plus the user's own ones, keyed by id."""
+    global_categories = await get_global_categories(session)
+    user_categories = await get_user_categories(user_id, session, redis_client)
+    return {**global_categories, **user_categories}
+
+async def invalidate_user_categories(user_id: int, redis_client) -> None:
+    _user_categories.pop(user_id)
+    await redis_client.incr(version_key(user_id))
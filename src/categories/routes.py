@@ -1,30 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
 from sqlalchemy import or_
 
 from src.categories.models import Category
+from src.categories.cache import get_available_categories, get_global_category_by_name, invalidate_user_categories, version_key
+from src.etag import conditional_get
+from src.responses import fast_json
+from src.rate_limit import rate_limit
+from src.config import settings
 from src.categories.schemas import CategoryCreate, CategoryRead
 from src.database import get_session
 from src.auth.depends import read_user
 from src.transactions.models import Transaction
+from src.recurring.models import RecurringTransaction
+from src.statistics.utils import move_rollup_category
+from src.redis_utils import get_redis_client
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
-
-@router.get("/", response_model=list[CategoryRead])
-async def get_categories(session: AsyncSession = Depends(get_session), user = Depends(read_user)):
-    query = await session.execute(
-        select(Category).where(
-            or_(Category.user_id == None, Category.user_id == user.id)
-        )
-    )
-    result = query.scalars().all()
-
-    return result
-
-@router.post("/", response_model=CategoryRead, status_code=status.HTTP_201_CREATED)
-async def create_user_category(payload: CategoryCreate, session: AsyncSession = Depends(get_session), user = Depends(read_user)):
+CATEGORIES_ETAG = conditional_get(version_key)
+WRITE_LIMIT = rate_limit("write", ip=settings.RATE_LIMIT_WRITE_IP)
+
+@router.get("/", response_model=list[CategoryRead], dependencies=[Depends(CATEGORIES_ETAG)])
+async def get_categories(response: Response, session: AsyncSession = Depends(get_session), user = Depends(read_user), redis_client = Depends(get_redis_client)):
+    categories = await get_available_categories(user.id, session, redis_client)
+
+    return fast_json([_category_json(categories[category_id]) for category_id in sorted(categories)], response)
+
+def _category_json(category: CategoryRead) -> dict:
+    return {
+        "name": category.name,
+        "color": category.color,
+        "icon": category.icon,
+        "id": category.id,
+        "user_id": category.user_id,
+    }
+
+@router.post("/", response_model=CategoryRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(WRITE_LIMIT)])
+async def create_user_category(payload: CategoryCreate, session: AsyncSession = Depends(get_session), user = Depends(read_user), redis_client = Depends(get_redis_client)):
     query = select(Category).where(
         Category.name.ilike(payload.name.strip()),
         or_(
@@ -42,11 +56,12 @@ async def create_user_category(payload: CategoryCreate, session: AsyncSession =
     session.add(new_category)
     await session.commit()
     await session.refresh(new_category)
+    await invalidate_user_categories(user.id, redis_client)
 
     return new_category
 
 
-@router.patch("/{category_id}", response_model=CategoryRead, responses={
+@router.patch("/{category_id}", response_model=CategoryRead, dependencies=[Depends(WRITE_LIMIT)], responses={
     status.HTTP_403_FORBIDDEN: {"description": "You cannot edit global or other users' categories"},
     status.HTTP_404_NOT_FOUND: {"description": "Category does not exist"},
     status.HTTP_409_CONFLICT: {"description": "Category with this name already exists"},
@@ -55,7 +70,8 @@ async def update_category(
         category_id: int,
         payload: CategoryCreate,
         session: AsyncSession = Depends(get_session),
-        user=Depends(read_user)
+        user=Depends(read_user),
+        redis_client = Depends(get_redis_client)
 ):
     category = await session.get(Category, category_id)
 
@@ -92,11 +108,12 @@ async def update_category(
 
     await session.commit()
     await session.refresh(category)
+    await invalidate_user_categories(user.id, redis_client)
 
     return category
 
-@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_category(category_id: int, session: AsyncSession = Depends(get_session), user = Depends(read_user)):
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(WRITE_LIMIT)])
+async def delete_category(category_id: int, session: AsyncSession = Depends(get_session), user = Depends(read_user), redis_client = Depends(get_redis_client)):
     category = await session.get(Category, category_id)
 
     if not category:
@@ -105,12 +122,7 @@ async def delete_category(category_id: int, session: AsyncSession = Depends(get_
     if category.user_id != user.id:
         raise HTTPException(status_code=403, detail="You cannot edit other users' categories")
 
-    query = select(Category).where(
-        Category.name == "Інше",
-        Category.user_id == None
-    )
-    result = await session.execute(query)
-    other_category = result.scalar_one_or_none()
+    other_category = await get_global_category_by_name("Інше", session)
 
     stmt = (
         update(Transaction)
@@ -119,8 +131,15 @@ async def delete_category(category_id: int, session: AsyncSession = Depends(get_
     )
 
     await session.execute(stmt)
+    await session.execute(
+        update(RecurringTransaction)
+        .where(RecurringTransaction.category_id == category_id)
+        .values(category_id=other_category.id)
+    )
+    await move_rollup_category(session, category_id, other_category.id)
 
     await session.delete(category)
     await session.commit()
+    await invalidate_user_categories(user.id, redis_client)
 
     return
\ No newline at end of file
@@ -7,6 +7,17 @@ class RedisConfig(BaseModel):
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER: bool = False
+
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SQL_EXPLAIN_SLOW_QUERIES: bool = False
+    N_PLUS_ONE_THRESHOLD: int = 5
+    METRICS_TOKEN: str = ""
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -14,10 +25,43 @@ class Settings(BaseSettings):
 
     RESEND_API: str
 
+    EMAIL_FROM: str = "noreply@x0ryz.cc"
+    EMAIL_TRANSPORT: str = "resend"
+    EMAIL_FILE_PATH: str = "emails.jsonl"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    EMAIL_CONCURRENCY: int = 10
+    EMAIL_PREFETCH: int = 20
+    EMAIL_MAX_RETRIES: int = 5
+    EMAIL_RETRY_BASE_DELAY: float = 1.0
+
     REDIS_HOST: str
     REDIS_PORT: int
 
+    USER_CACHE_TTL: int = 300
+    USER_LOCAL_CACHE_TTL: int = 30
+    DASHBOARD_CACHE_TTL: int = 86400
+    CATEGORY_CACHE_TTL: int = 300
+
+    PASSWORD_HASH_WORKERS: int = 4
+    ARGON2_ROUNDS: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_IP: str = "30/minute"
+    RATE_LIMIT_LOGIN_EMAIL: str = "5/minute"
+    RATE_LIMIT_REGISTER_IP: str = "10/hour"
+    RATE_LIMIT_FORGOT_IP: str = "10/hour"
+    RATE_LIMIT_FORGOT_EMAIL: str = "3/hour"
+    RATE_LIMIT_WRITE_IP: str = "300/minute"
+
     RABBITMQ_URL: str
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+
+    RECURRING_JOB_INTERVAL: int = 3600
+    RECURRING_MAX_OCCURRENCES: int = 366
 
     @property
     def redis(self) -> RedisConfig:
@@ -1,13 +1,108 @@
+import time
+import uuid
+
+from sqlalchemy import exc
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.config import settings
+from src.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_OVERFLOW_EVENTS, DB_POOL_TIMEOUTS
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        self.checkouts += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        if overflowed:
+            self.overflow_events += 1
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how often the overflow is used."""
+
+    def connect(self):
+        overflow_before = self.overflow()
+        started = time.perf_counter()
+
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise
 
-engine = create_async_engine(settings.DATABASE_URL)
+        wait = time.perf_counter() - started
+        overflowed = self.overflow() > max(overflow_before, 0)
+        pool_stats.record_checkout(wait, overflowed)
+        DB_POOL_CHECKOUT_WAIT.observe(wait)
+        if overflowed:
+            DB_POOL_OVERFLOW_EVENTS.inc()
+        return connection
+
+
+def _engine_options() -> dict:
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode hands every transaction to a different server connection,
+        # so prepared statements must be neither cached nor reused by name.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 Base = declarative_base()
 
+def get_pool_status() -> dict:
+    pool = engine.sync_engine.pool
+
+    status = {
+        "checkouts": pool_stats.checkouts,
+        "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+        "overflow_events": pool_stats.overflow_events,
+        "timeouts": pool_stats.timeouts,
+    }
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+
+    return status
+
 async def get_session():
     async with async_session() as session:
         try:
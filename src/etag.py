@@ -0,0 +1,57 @@
+import hashlib
+import time
+from datetime import date
+from typing import Callable
+from urllib.parse import urlencode
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from src.auth.cache import decode_token_cached
+from src.auth.depends import get_token
+from src.redis_utils import get_redis_client
+
+
+def _parse_if_none_match(header: str) -> set[str]:
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+async def _read_versions(keys: list[str], redis_client) -> list[str]:
+    versions = await redis_client.mget(*keys)
+
+    for i, version in enumerate(versions):
+        if version is None:
+            # Start from a unique value rather than 0, so tags issued before Redis lost the key can't match again.
+            await redis_client.set(keys[i], str(time.time_ns()), nx=True)
+            versions[i] = await redis_client.get(keys[i])
+
+    return versions
+
+def conditional_get(*version_keys: Callable[[int], str]):
+    """
+    Dependency that tags a GET response with the user's data versions.
+
+    It needs only the token and one Redis round trip, so a matching `If-None-Match` is answered with 304
+    before the route opens a DB session. Register it in the route's `dependencies` so it is resolved first.
+    Writers bump the versions after committing, so a tag never outlives the data it describes.
+    """
+    async def dependency(
+            request: Request,
+            response: Response,
+            token: str = Depends(get_token),
+            redis_client = Depends(get_redis_client),
+    ) -> None:
+        user_id = decode_token_cached(token).get("sub")
+        if not user_id:
+            return
+
+        versions = await _read_versions([key(int(user_id)) for key in version_keys], redis_client)
+        # Defaults of date parameters depend on the current day, so it is part of the tag.
+        raw = "|".join([user_id, request.url.path, urlencode(sorted(request.query_params.multi_items())), date.today().isoformat(), *versions])
+        etag = f'"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in _parse_if_none_match(if_none_match)):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+
+    return dependency
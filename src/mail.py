@@ -0,0 +1,108 @@
+import asyncio
+import json
+import smtplib
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+
+import resend
+
+from src.config import settings
+
+
+def build_email(msg: dict) -> dict:
+    if "code" in msg:
+        return {
+            "from": settings.EMAIL_FROM,
+            "to": [msg["email"]],
+            "subject": "Your Verification Code",
+            "html": f"<p>Code: <strong>{msg['code']}</strong></p>"
+        }
+
+    if "token" in msg:
+        reset_link = f"https://x0ryz.cc/reset?token={msg['token']}"
+
+        return {
+            "from": settings.EMAIL_FROM,
+            "to": [msg["email"]],
+            "subject": "Reset Your Password",
+            "html": f"""
+                        <p>Click the link below to reset your password:</p>
+                        <a href="{reset_link}">Reset Password</a>
+                        <p>Link expires in 15 minutes.</p>
+                    """
+        }
+
+    raise ValueError("Unknown email message")
+
+
+class EmailTransport(ABC):
+    @abstractmethod
+    async def send(self, params: dict) -> None:
+        """Sends one email built by `build_email`; raises on failure so `deliver` can retry."""
+
+
+class ResendTransport(EmailTransport):
+    def __init__(self, api_key: str):
+        resend.api_key = api_key
+
+    async def send(self, params: dict) -> None:
+        await asyncio.to_thread(resend.Emails.send, params)
+
+
+class SMTPTransport(EmailTransport):
+    """Plain SMTP, e.g. a local MailHog / Mailpit instance during development."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+    def _send(self, params: dict) -> None:
+        message = EmailMessage()
+        message["From"] = params["from"]
+        message["To"] = ", ".join(params["to"])
+        message["Subject"] = params["subject"]
+        message.set_content(params["html"], subtype="html")
+
+        with smtplib.SMTP(self.host, self.port) as smtp:
+            smtp.send_message(message)
+
+    async def send(self, params: dict) -> None:
+        await asyncio.to_thread(self._send, params)
+
+
+class FileTransport(EmailTransport):
+    """Appends every email as a JSON line to a file instead of sending it."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, params: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(params, ensure_ascii=False) + "\n")
+
+    async def send(self, params: dict) -> None:
+        await asyncio.to_thread(self._write, params)
+
+
+def get_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "smtp":
+        return SMTPTransport(settings.SMTP_HOST, settings.SMTP_PORT)
+
+    if settings.EMAIL_TRANSPORT == "file":
+        return FileTransport(settings.EMAIL_FILE_PATH)
+
+    return ResendTransport(settings.RESEND_API)
+
+
+async def deliver(msg: dict, transport: EmailTransport, retries: int, base_delay: float) -> None:
+    """Sends the email, retrying with exponential backoff. Re-raises the last error when retries are exhausted."""
+    params = build_email(msg)
+
+    for attempt in range(retries + 1):
+        try:
+            await transport.send(params)
+            return
+        except Exception:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(base_delay * 2 ** attempt)
@@ -1,7 +1,7 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
 
@@ -9,20 +9,32 @@ from src.auth.routes import router as auth_router
 from src.transactions.routes import router as transactions_router
 from src.categories.routes import router as categories_router
 from src.statistics.routes import router as statistics_router
+from src.recurring.routes import router as recurring_router
 from src.redis_utils import init_redis, close_redis
+from src.auth.utils import configure_password_hashing
+from src.categories.cache import load_global_categories
+from src.database import async_session, engine, get_pool_status
+from src.metrics import instrument_engine, metrics_middleware, render_metrics, require_metrics_token, update_pool_metrics
 from src.mq import broker
+from src.outbox.relay import relay
 
 logger = logging.getLogger("uvicorn")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    configure_password_hashing()
+    async with async_session() as session:
+        await load_global_categories(session)
+    logger.info("Global categories loaded.")
     await init_redis()
     logger.info("Redis connected successfully.")
     await broker.connect()
     logger.info("FastStream connected successfully.")
+    relay.start()
 
     yield
 
+    await relay.stop()
     await broker.close()
     logger.info("FastStream connection closed.")
     await close_redis()
@@ -34,6 +46,25 @@ app.include_router(auth_router)
 app.include_router(transactions_router)
 app.include_router(categories_router)
 app.include_router(statistics_router)
+app.include_router(recurring_router)
+
+instrument_engine(engine)
+
+@app.middleware("http")
+async def collect_metrics(request: Request, call_next):
+    response = await metrics_middleware(request, call_next)
+    update_pool_metrics(get_pool_status())
+    return response
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    update_pool_metrics(get_pool_status())
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+@app.get("/health/db-pool", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def db_pool_status():
+    return get_pool_status()
 
 add_pagination(app)
 app.add_middleware(
@@ -0,0 +1,195 @@
+import logging
+import os
+import secrets
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Duration of a single SQL statement",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements issued by one HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL time spent by one HTTP request",
+    ["route"],
+)
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+)
+BROKER_PUBLISH_LATENCY = Histogram(
+    "broker_publish_duration_seconds",
+    "RabbitMQ publish latency",
+    ["queue"],
+)
+BROKER_PUBLISH_ERRORS = Counter(
+    "broker_publish_errors",
+    "Failed RabbitMQ publishes",
+    ["queue"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW_EVENTS = Counter(
+    "db_pool_overflow_events",
+    "Checkouts that had to open an overflow connection",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.statements: StatementCounter[str] = StatementCounter()
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _explain(conn, statement, parameters) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+def _log_slow_query(conn, statement, parameters, elapsed: float):
+    message = f"Slow query ({elapsed * 1000:.1f} ms): {statement}"
+
+    if settings.SQL_EXPLAIN_SLOW_QUERIES and statement.lstrip().upper().startswith("SELECT"):
+        try:
+            message += f"\nPlan:\n{_explain(conn, statement, parameters)}"
+        except Exception as e:
+            message += f"\nPlan is not available: {e}"
+
+    logger.warning(message)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_time += elapsed
+        stats.statements[statement] += 1
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _log_slow_query(conn, statement, parameters, elapsed)
+
+def instrument_engine(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+async def metrics_middleware(request, call_next):
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = route_template(request)
+        REQUEST_LATENCY.labels(request.method, route, str(status_code)).observe(time.perf_counter() - started)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+        DB_TIME_PER_REQUEST.labels(route).observe(stats.query_time)
+        request_stats.reset(token)
+
+        for statement, count in stats.repeated_statements(settings.N_PLUS_ONE_THRESHOLD):
+            logger.warning(f"Possible N+1 in {request.method} {route}: statement ran {count} times: {statement}")
+
+
+@contextmanager
+def record_queries(engine: AsyncEngine):
+    """Collects every SQL statement executed on `engine` inside the block."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def update_pool_metrics(pool_status: dict):
+    DB_POOL_CHECKED_OUT.set(pool_status.get("checked_out", 0))
+
+def require_metrics_token(request: Request):
+    """Guards the monitoring endpoints: 404 unless METRICS_TOKEN is set, 401 without `Authorization: Bearer <token>`."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+def render_metrics() -> tuple[bytes, str]:
+    """Aggregates all gunicorn workers when PROMETHEUS_MULTIPROC_DIR is set, otherwise this process only."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
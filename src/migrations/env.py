@@ -25,6 +25,9 @@ if config.config_file_name is not None:
 from src.auth.models import User
 from src.transactions.models import Transaction
 from src.categories.models import Category
+from src.statistics.models import DailyRollup
+from src.outbox.models import OutboxMessage
+from src.recurring.models import RecurringTransaction
 from src.database import Base
 target_metadata = Base.metadata
 
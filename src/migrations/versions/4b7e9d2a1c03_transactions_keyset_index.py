@@ -0,0 +1,33 @@
+"""transactions_keyset_index
+
+Revision ID: 4b7e9d2a1c03
+Revises: 31abc075dfc8
+Create Date: 2026-10-18 17:20:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e9d2a1c03'
+down_revision: Union[str, Sequence[str], None] = '31abc075dfc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_user_id_date_id',
+        'transactions',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_date_id', table_name='transactions')
@@ -0,0 +1,35 @@
+"""transactions_name_search
+
+Revision ID: 5d1a7c3e9f26
+Revises: 9c2f5e8b7a14
+Create Date: 2026-10-18 21:05:12.480317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1a7c3e9f26'
+down_revision: Union[str, Sequence[str], None] = '9c2f5e8b7a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_transactions_name_trgm',
+        'transactions',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_name_trgm', table_name='transactions')
@@ -0,0 +1,39 @@
+"""transactions_filter_indexes
+
+Revision ID: 7e4b2d9f1a58
+Revises: 5d1a7c3e9f26
+Create Date: 2026-10-18 21:40:37.912604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4b2d9f1a58'
+down_revision: Union[str, Sequence[str], None] = '5d1a7c3e9f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_user_id_category_id_date',
+        'transactions',
+        ['user_id', 'category_id', 'date'],
+        unique=False
+    )
+    op.create_index(
+        'ix_transactions_user_id_type_date',
+        'transactions',
+        ['user_id', 'type', 'date'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_type_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_id_category_id_date', table_name='transactions')
@@ -0,0 +1,47 @@
+"""daily_rollups
+
+Revision ID: 9c2f5e8b7a14
+Revises: 4b7e9d2a1c03
+Create Date: 2026-10-18 17:48:03.562911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f5e8b7a14'
+down_revision: Union[str, Sequence[str], None] = '4b7e9d2a1c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', 'type', 'category_id', name='uq_daily_rollups_user_day_type_category', postgresql_nulls_not_distinct=True)
+    )
+
+    op.execute("""
+        INSERT INTO daily_rollups (user_id, day, type, category_id, total, count)
+        SELECT user_id, (date AT TIME ZONE 'UTC')::date, type, category_id, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, (date AT TIME ZONE 'UTC')::date, type, category_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_rollups')
@@ -0,0 +1,69 @@
+"""recurring_transactions
+
+Revision ID: a4d9e2c7b318
+Revises: 8f3c6a1d2b47
+Create Date: 2026-10-18 23:58:41.207365
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2c7b318'
+down_revision: Union[str, Sequence[str], None] = '8f3c6a1d2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'recurring_transactions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('frequency', sa.String(), nullable=False),
+        sa.Column('interval', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('occurrences', sa.Integer(), nullable=False),
+        sa.Column('next_date', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_recurring_transactions_user_id', 'recurring_transactions', ['user_id'], unique=False)
+    op.create_index('ix_recurring_transactions_next_date', 'recurring_transactions', ['next_date'], unique=False)
+
+    op.add_column('transactions', sa.Column('recurring_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'transactions_recurring_id_fkey',
+        'transactions',
+        'recurring_transactions',
+        ['recurring_id'],
+        ['id'],
+        ondelete='SET NULL'
+    )
+    op.create_index(
+        'ix_transactions_recurring_id_date',
+        'transactions',
+        ['recurring_id', 'date'],
+        unique=True,
+        postgresql_where=sa.text('recurring_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_recurring_id_date', table_name='transactions')
+    op.drop_constraint('transactions_recurring_id_fkey', 'transactions', type_='foreignkey')
+    op.drop_column('transactions', 'recurring_id')
+    op.drop_index('ix_recurring_transactions_next_date', table_name='recurring_transactions')
+    op.drop_index('ix_recurring_transactions_user_id', table_name='recurring_transactions')
+    op.drop_table('recurring_transactions')
@@ -1,4 +1,17 @@
+import time
+
 from faststream.rabbit import RabbitBroker
 from src.config import settings
+from src.metrics import BROKER_PUBLISH_ERRORS, BROKER_PUBLISH_LATENCY
+
+broker = RabbitBroker(settings.RABBITMQ_URL)
 
-broker = RabbitBroker(settings.RABBITMQ_URL)
\ No newline at end of file
+async def publish(message: dict, queue: str):
+    started = time.perf_counter()
+    try:
+        return await broker.publish(message, queue=queue)
+    except Exception:
+        BROKER_PUBLISH_ERRORS.labels(queue).inc()
+        raise
+    finally:
+        BROKER_PUBLISH_LATENCY.labels(queue).observe(time.perf_counter() - started)
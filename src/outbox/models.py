@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, String, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class OutboxMessage(Base):
+    """A broker message written in the same transaction as the change that caused it, deleted once published."""
+
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    queue: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.database import async_session
+from src.mq import publish
+from src.outbox.models import OutboxMessage
+
+logger = logging.getLogger("uvicorn")
+
+
+def add_message(session: AsyncSession, message: dict, queue: str):
+    """Queues `message` for publishing when the session's transaction commits."""
+    session.add(OutboxMessage(queue=queue, payload=message))
+
+
+class OutboxRelay:
+    """
+    Publishes outbox rows from a background task, oldest first, `batch_size` at a time.
+
+    The table is polled every `poll_interval` seconds; `wake` lets a request that has just committed
+    a message skip the wait. On Postgres each batch is claimed with FOR UPDATE SKIP LOCKED, so the
+    relays of several workers never publish the same row. Delivery is at least once: a row whose
+    publish fails stays in the table and is retried with the next batch.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, batch_size: int, poll_interval: float):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self):
+        self._wakeup.set()
+
+    async def relay_batch(self) -> int:
+        """Publishes one batch and returns how many rows were published."""
+        async with self.session_factory() as session:
+            stmt = (
+                select(OutboxMessage.id, OutboxMessage.queue, OutboxMessage.payload)
+                .order_by(OutboxMessage.id)
+                .limit(self.batch_size)
+            )
+            if session.bind.dialect.name == "postgresql":
+                stmt = stmt.with_for_update(skip_locked=True)
+
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return 0
+
+            results = await asyncio.gather(
+                *(publish(row.payload, queue=row.queue) for row in rows),
+                return_exceptions=True,
+            )
+            published = [row.id for row, result in zip(rows, results) if not isinstance(result, Exception)]
+
+            if published:
+                await session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(published)))
+            await session.commit()
+
+        if len(published) < len(rows):
+            error = next(result for result in results if isinstance(result, Exception))
+            logger.warning(f"Outbox relay: {len(rows) - len(published)} of {len(rows)} messages not published: {error}")
+        return len(published)
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                published = await self.relay_batch()
+            except Exception:
+                logger.exception("Outbox relay batch failed")
+                published = 0
+
+            # A full batch means more rows are probably waiting.
+            if published == self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+relay = OutboxRelay(async_session, settings.OUTBOX_BATCH_SIZE, settings.OUTBOX_POLL_INTERVAL)
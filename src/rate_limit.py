@@ -0,0 +1,104 @@
+import math
+import re
+import secrets
+from dataclasses import dataclass
+from functools import cache
+
+from fastapi import Depends, HTTPException, Request, status
+
+from src.config import settings
+from src.redis_utils import LuaScript, get_redis_client
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Sliding-window log: one sorted set of request timestamps per key. All keys are checked before any is
+# recorded, so a request rejected by one limit doesn't use up the others. Returns 0 when the request is
+# allowed, otherwise the milliseconds until the oldest entry of the fullest window expires.
+SLIDING_WINDOW = LuaScript("""
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[i * 2])
+    local limit = tonumber(ARGV[i * 2 + 1])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now, 1)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, ARGV[i * 2])
+end
+return 0
+""")
+
+
+@dataclass(frozen=True)
+class Limit:
+    count: int
+    seconds: int
+
+@cache
+def parse_limit(spec: str) -> Limit | None:
+    """`"5/minute"`, `"100/hour"` or `"10/30"` (seconds). An empty spec means no limit."""
+    if not spec:
+        return None
+
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+|second|minute|hour|day)\s*", spec)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {spec!r}")
+
+    count, period = match.groups()
+    return Limit(int(count), PERIODS.get(period) or int(period))
+
+async def _body_email(request: Request) -> str | None:
+    # FastAPI has already read the body, so this only parses the cached bytes again.
+    try:
+        email = (await request.json()).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) else None
+
+def rate_limit(scope: str, *, ip: str = "", email: str = ""):
+    """
+    Dependency limiting requests to a route per client IP and/or per `email` in the JSON body.
+
+    Limits are specs for `parse_limit`. Register it in the route's `dependencies` so it runs before
+    the route's own dependencies, i.e. before any DB session is opened or password hashed.
+    Over the limit it answers 429 with `Retry-After`.
+    """
+    ip_limit, email_limit = parse_limit(ip), parse_limit(email)
+
+    async def dependency(request: Request, redis_client = Depends(get_redis_client)) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        keys, args = [], []
+        if ip_limit and request.client:
+            keys.append(f"rate:{scope}:ip:{request.client.host}")
+            args += [ip_limit.seconds * 1000, ip_limit.count]
+
+        if email_limit and (address := await _body_email(request)):
+            keys.append(f"rate:{scope}:email:{address}")
+            args += [email_limit.seconds * 1000, email_limit.count]
+
+        if not keys:
+            return
+
+        retry_after = int(await SLIDING_WINDOW(redis_client, keys, [secrets.token_hex(8), *args]))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after / 1000))},
+            )
+
+    return dependency
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Integer, ForeignKey, String, Date, Float, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class RecurringTransaction(Base):
+    """
+    A rule that creates the same transaction every `interval` days/weeks/months/years from `start_date`.
+
+    `occurrences` counts the occurrences already generated and `next_date` is the date of the next
+    one, or NULL once the rule has ended; the generator only looks at rules with `next_date` due.
+    """
+
+    __tablename__ = "recurring_transactions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    category_id = mapped_column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+
+    type: Mapped[str] = mapped_column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+
+    frequency: Mapped[str] = mapped_column(String, nullable=False)
+    interval: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+
+Index("ix_recurring_transactions_next_date", RecurringTransaction.next_date)
@@ -0,0 +1,140 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.auth.depends import read_user
+from src.auth.models import User
+from src.categories.cache import get_available_categories
+from src.categories.models import Category
+from src.categories.schemas import CategoryRead
+from src.config import settings
+from src.database import get_session
+from src.rate_limit import rate_limit
+from src.recurring.models import RecurringTransaction
+from src.recurring.schemas import RecurringCreate, RecurringOut, RecurringUpdate
+from src.recurring.utils import next_date_after
+from src.redis_utils import get_redis_client
+
+router = APIRouter(prefix="/recurring", tags=["Recurring transactions"])
+WRITE_LIMIT = rate_limit("write", ip=settings.RATE_LIMIT_WRITE_IP)
+
+
+def _rule_out(rule: RecurringTransaction, categories: dict[int, CategoryRead]) -> RecurringOut:
+    return RecurringOut(
+        id=rule.id,
+        type=rule.type,
+        name=rule.name,
+        amount=rule.amount,
+        frequency=rule.frequency,
+        interval=rule.interval,
+        start_date=rule.start_date,
+        end_date=rule.end_date,
+        next_date=rule.next_date,
+        category=categories.get(rule.category_id),
+    )
+
+@router.get("/", response_model=list[RecurringOut])
+async def get_recurring_transactions(session: AsyncSession = Depends(get_session), user: User = Depends(read_user), redis_client = Depends(get_redis_client)):
+    categories = await get_available_categories(user.id, session, redis_client)
+    result = await session.execute(
+        select(RecurringTransaction)
+        .where(RecurringTransaction.user_id == user.id)
+        .order_by(RecurringTransaction.id)
+    )
+
+    return [_rule_out(rule, categories) for rule in result.scalars().all()]
+
+@router.post("/", response_model=RecurringOut, status_code=status.HTTP_201_CREATED, dependencies=[Depends(WRITE_LIMIT)])
+async def create_recurring_transaction(
+        payload: RecurringCreate,
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user),
+        redis_client = Depends(get_redis_client)
+):
+    """
+    Creates a rule that adds the same transaction on a schedule.
+
+    Occurrences are created by the worker, dated at 12:00 UTC. A `start_date` in the past makes it
+    create the occurrences already due on its next run.
+    """
+    categories = await get_available_categories(user.id, session, redis_client)
+
+    if payload.category_id not in categories:
+        raise HTTPException(
+            status_code=404,
+            detail="Category not found or you don't have access to it"
+        )
+
+    rule = RecurringTransaction(
+        **payload.model_dump(),
+        user_id=user.id,
+        occurrences=0,
+        next_date=payload.start_date,
+    )
+    session.add(rule)
+    await session.commit()
+
+    return _rule_out(rule, categories)
+
+@router.patch("/{rule_id}", response_model=RecurringOut, dependencies=[Depends(WRITE_LIMIT)], responses={
+    status.HTTP_403_FORBIDDEN: {"description": "You cannot edit other users' recurring transactions"},
+    status.HTTP_404_NOT_FOUND: {"description": "Recurring transaction does not exist"},
+})
+async def update_recurring_transaction(
+        rule_id: int,
+        payload: RecurringUpdate,
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user),
+        redis_client = Depends(get_redis_client)
+):
+    """
+    Changes what future occurrences look like; transactions created already are left as they are.
+
+    The schedule itself cannot be changed, only where it ends: create a new rule for a different one.
+    """
+    rule = await _get_owned_rule(session, rule_id, user.id, "You cannot edit other users' recurring transactions")
+    categories = await get_available_categories(user.id, session, redis_client)
+
+    if payload.category_id is not None and payload.category_id not in categories:
+        new_category = await session.get(Category, payload.category_id)
+
+        if not new_category:
+            raise HTTPException(status_code=404, detail="New category not found")
+
+        raise HTTPException(status_code=403, detail="You cannot assign a category that belongs to another user")
+
+    update_data = payload.model_dump(exclude_unset=True)
+
+    if update_data.get("end_date") is not None and update_data["end_date"] < rule.start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+
+    for key, value in update_data.items():
+        setattr(rule, key, value)
+
+    if "end_date" in update_data:
+        rule.next_date = next_date_after(rule)
+
+    await session.commit()
+
+    return _rule_out(rule, categories)
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(WRITE_LIMIT)])
+async def delete_recurring_transaction(rule_id: int, session: AsyncSession = Depends(get_session), user: User = Depends(read_user)):
+    """Stops the rule. Transactions it already created are kept."""
+    rule = await _get_owned_rule(session, rule_id, user.id, "You cannot delete other users' recurring transactions")
+
+    await session.delete(rule)
+    await session.commit()
+
+    return
+
+async def _get_owned_rule(session: AsyncSession, rule_id: int, user_id: int, forbidden_detail: str) -> RecurringTransaction:
+    rule = await session.get(RecurringTransaction, rule_id)
+
+    if not rule:
+        raise HTTPException(status_code=404, detail="Recurring transaction not found")
+
+    if rule.user_id != user_id:
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+
+    return rule
@@ -0,0 +1,57 @@
+from datetime import date
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from src.categories.schemas import CategoryRead
+
+Frequency = Literal["daily", "weekly", "monthly", "yearly"]
+
+
+class RecurringCreate(BaseModel):
+    type: Literal["income", "expense"] = "expense"
+    name: str
+    amount: Decimal = Field(..., gt=0, decimal_places=2)
+    category_id: int
+    frequency: Frequency = "monthly"
+    interval: int = Field(1, ge=1, le=366)
+    start_date: date
+    end_date: date | None = None
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurringUpdate(BaseModel):
+    type: Literal["income", "expense"] | None = None
+    name: str | None = Field(None, min_length=2, max_length=50)
+    amount: Decimal | None = Field(None, gt=0, decimal_places=2)
+    category_id: int | None = None
+    end_date: date | None = None
+
+    @field_validator("type", "name", "amount")
+    @classmethod
+    def check_not_null(cls, value):
+        # Only sent values are validated, so this rejects an explicit null; end_date and category_id may be cleared.
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class RecurringOut(BaseModel):
+    id: int
+    type: str
+    name: str
+    amount: Decimal
+    frequency: Frequency
+    interval: int
+    start_date: date
+    end_date: date | None = None
+    next_date: date | None = None
+    category: CategoryRead | None = None
+
+    model_config = ConfigDict(from_attributes=True)
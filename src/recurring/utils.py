@@ -0,0 +1,153 @@
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import Date, DateTime, and_, case, cast, func, literal_column, or_, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.recurring.models import RecurringTransaction
+from src.statistics.utils import add_many_to_rollup
+from src.transactions.models import Transaction
+
+# frequency -> (months, days) per step
+FREQUENCY_STEPS = {"daily": (0, 1), "weekly": (0, 7), "monthly": (1, 0), "yearly": (12, 0)}
+# Arbitrary key for pg_advisory_xact_lock, so overlapping runs wait for each other instead of racing.
+GENERATOR_LOCK_ID = 7_318_204
+
+Rule = RecurringTransaction
+
+
+def occurrence_date(start: date, frequency: str, interval: int, n: int) -> date:
+    """
+    Date of the `n`-th occurrence (0 is `start_date`).
+
+    Months are counted from the start date, so a rule starting on the 31st falls on the last day
+    of shorter months and returns to the 31st afterwards. Must agree with `_occurrence`.
+    """
+    months, days = FREQUENCY_STEPS[frequency]
+    year, month = divmod(start.month - 1 + months * interval * n, 12)
+    year, month = start.year + year, month + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day) + timedelta(days=days * interval * n)
+
+def next_date_after(rule: RecurringTransaction) -> date | None:
+    """The first occurrence not generated yet, or `None` when it is past the end date."""
+    next_date = occurrence_date(rule.start_date, rule.frequency, rule.interval, rule.occurrences)
+    if rule.end_date is not None and next_date > rule.end_date:
+        return None
+    return next_date
+
+def _steps():
+    months = case(*((Rule.frequency == name, Rule.interval * step) for name, (step, _) in FREQUENCY_STEPS.items() if step), else_=0)
+    days = case(*((Rule.frequency == name, Rule.interval * step) for name, (_, step) in FREQUENCY_STEPS.items() if step), else_=0)
+    return months, days
+
+def _occurrence(n, dialect_name: str):
+    """SQL date of the rule's `n`-th occurrence, the same as `occurrence_date`."""
+    months, days = _steps()
+    months, days = months * n, days * n
+
+    if dialect_name == "postgresql":
+        # Postgres clamps the day of month itself: date '2025-01-31' + interval '1 month' is Feb 28.
+        return cast(Rule.start_date.op("+")(func.make_interval(0, months, 0, days)), Date)
+
+    same_day = func.date(Rule.start_date, func.printf("%+d months", months))
+    last_day = func.date(Rule.start_date, "start of month", func.printf("%+d months", months + 1), "-1 day")
+    return func.date(func.min(same_day, last_day), func.printf("%+d days", days))
+
+def _occurrence_time(occurrence, dialect_name: str):
+    """Occurrences are dated at 12:00 UTC, which keeps the calendar date in every zone from UTC-11 to UTC+11."""
+    if dialect_name == "postgresql":
+        return func.timezone("UTC", cast(occurrence, DateTime).op("+")(literal_column("interval '12 hours'")))
+    return func.strftime("%Y-%m-%d 12:00:00.000000", occurrence)
+
+def _numbers(count: int, dialect_name: str):
+    """Integers `0..count - 1` as a subquery with an `n` column."""
+    if dialect_name == "postgresql":
+        return select(func.generate_series(0, count - 1).label("n")).subquery("numbers")
+
+    numbers = select(literal_column("0").label("n")).cte("numbers", recursive=True)
+    numbers = numbers.union_all(select(numbers.c.n + 1).where(numbers.c.n < count - 1))
+    return select(numbers.c.n).subquery("series")
+
+def _candidates(today: date, count: int, dialect_name: str):
+    """The next `count` occurrences of every due rule, with their date as `day`."""
+    numbers = _numbers(count, dialect_name)
+    return (
+        select(
+            Rule.id, Rule.user_id, Rule.category_id, Rule.type, Rule.name, Rule.amount, Rule.end_date,
+            _occurrence(Rule.occurrences + numbers.c.n, dialect_name).label("day"),
+        )
+        .join(numbers, true())
+        .where(Rule.next_date <= today)
+        .subquery("candidates")
+    )
+
+def _insert(session: AsyncSession):
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(Transaction)
+    return sqlite.insert(Transaction)
+
+async def generate_due_transactions(session: AsyncSession, today: date, max_occurrences: int) -> dict[int, int]:
+    """
+    Creates every occurrence due up to `today` for all users and returns `{user_id: created}`.
+
+    All rules are handled by one `INSERT ... SELECT` over the due rules joined with a series of
+    occurrence numbers, followed by one `UPDATE ... FROM` moving their `occurrences`/`next_date` forward.
+    A rule gets at most `max_occurrences` per run; a longer backlog is caught up by later runs.
+
+    Re-running is safe: `next_date` only covers occurrences that were not generated yet, and the
+    unique `(recurring_id, date)` index makes the insert skip any that already exist. Runs in the
+    caller's transaction, which must be committed.
+    """
+    dialect_name = session.bind.dialect.name
+    if dialect_name == "postgresql":
+        await session.execute(select(func.pg_advisory_xact_lock(GENERATOR_LOCK_ID)))
+
+    oldest = await session.scalar(select(func.min(Rule.next_date)).where(Rule.next_date <= today))
+    if oldest is None:
+        return {}
+
+    candidates = _candidates(today, min((today - oldest).days + 1, max_occurrences), dialect_name)
+    is_due = and_(
+        candidates.c.day <= today,
+        or_(candidates.c.end_date.is_(None), candidates.c.day <= candidates.c.end_date),
+    )
+
+    rows = select(
+        candidates.c.user_id, candidates.c.category_id, candidates.c.type, candidates.c.name, candidates.c.amount,
+        _occurrence_time(candidates.c.day, dialect_name), candidates.c.id,
+    ).where(is_due)
+    stmt = (
+        _insert(session)
+        .from_select(["user_id", "category_id", "type", "name", "amount", "date", "recurring_id"], rows)
+        .on_conflict_do_nothing()
+        .returning(Transaction.user_id, Transaction.category_id, Transaction.type, Transaction.amount, Transaction.date)
+    )
+    created = (await session.execute(stmt)).mappings().all()
+
+    progress = (
+        select(candidates.c.id, func.count().label("generated"))
+        .where(is_due)
+        .group_by(candidates.c.id)
+        .subquery("progress")
+    )
+    next_date = _occurrence(Rule.occurrences + progress.c.generated, dialect_name)
+    await session.execute(
+        update(Rule)
+        .where(Rule.id == progress.c.id)
+        .values(
+            occurrences=Rule.occurrences + progress.c.generated,
+            next_date=case((next_date > Rule.end_date, None), else_=next_date),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    by_user = defaultdict(list)
+    for row in created:
+        by_user[row["user_id"]].append(row)
+    for user_id, transactions in by_user.items():
+        await add_many_to_rollup(session, user_id, transactions)
+
+    return {user_id: len(transactions) for user_id, transactions in by_user.items()}
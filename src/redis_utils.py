@@ -1,11 +1,41 @@
+import hashlib
+import time
+
 from redis import asyncio as aioredis
+from redis.exceptions import NoScriptError
 from src.config import settings
+from src.metrics import REDIS_COMMAND_LATENCY
+
+
+class InstrumentedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+
+class LuaScript:
+    """Runs a Lua script by EVALSHA, loading it once when Redis doesn't know it yet (first use, restart)."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    async def __call__(self, redis_client, keys: list, args: list):
+        try:
+            return await redis_client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            await redis_client.script_load(self.source)
+            return await redis_client.evalsha(self.sha, len(keys), *keys, *args)
+
 
 redis_client: aioredis.Redis | None = None
 
 async def init_redis():
     global redis_client
-    redis_client = aioredis.from_url(
+    redis_client = InstrumentedRedis.from_url(
         f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
         encoding="utf-8",
         decode_responses=True
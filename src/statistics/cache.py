@@ -0,0 +1,36 @@
+import json
+from datetime import date
+
+from src.config import settings
+from src.statistics.schemas import DashboardStats
+
+
+def version_key(user_id: int) -> str:
+    return f"stats_version:{user_id}"
+
+def _dashboard_key(user_id: int) -> str:
+    return f"dashboard:{user_id}"
+
+async def bump_stats_version(user_id: int, redis_client) -> None:
+    """Must be called after the write is committed, otherwise a reader may cache stale numbers under the new version."""
+    await redis_client.incr(version_key(user_id))
+
+async def get_cached_dashboard(user_id: int, month_start: date, redis_client) -> tuple[DashboardStats | None, str]:
+    """Returns the cached stats (if still valid) and the current version in a single round trip."""
+    version, raw = await redis_client.mget(version_key(user_id), _dashboard_key(user_id))
+    version = version or "0"
+
+    if raw:
+        data = json.loads(raw)
+        if data["version"] == version and data["month"] == month_start.isoformat():
+            return DashboardStats(**data["stats"]), version
+
+    return None, version
+
+async def cache_dashboard(user_id: int, month_start: date, version: str, stats: DashboardStats, redis_client) -> None:
+    data = {
+        "version": version,
+        "month": month_start.isoformat(),
+        "stats": stats.model_dump(),
+    }
+    await redis_client.set(_dashboard_key(user_id), json.dumps(data), ex=settings.DASHBOARD_CACHE_TTL)
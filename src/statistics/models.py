@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Integer, ForeignKey, String, Date, Float, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class DailyRollup(Base):
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "day", "type", "category_id",
+            name="uq_daily_rollups_user_day_type_category",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    category_id = mapped_column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    type: Mapped[str] = mapped_column(String, nullable=False)
+
+    total: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,37 +1,50 @@
 from datetime import date, timedelta, datetime
+from typing import Literal, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func, and_, or_, case
-from sqlalchemy.orm import joinedload
 
 from src.database import get_session
 from src.statistics.schemas import CategoryStat, DailyStat, DashboardStats
 from src.auth.models import User
+from src.statistics.models import DailyRollup
+from src.statistics.utils import bucket, bucket_series, local_range, local_time, truncate_date
 from src.transactions.models import Transaction
+from src.statistics.cache import get_cached_dashboard, cache_dashboard, version_key as stats_version_key
+from src.categories.cache import version_key as categories_version_key
+from src.etag import conditional_get
+from src.responses import fast_json
+from src.redis_utils import get_redis_client
 from src.categories.models import Category
 from src.auth.depends import read_user
 
 router = APIRouter(prefix="/statistics", tags=["Statistics"])
+STATISTICS_ETAG = conditional_get(stats_version_key, categories_version_key)
 
-@router.get("/dashboard", response_model=DashboardStats)
-async def get_dashboard_stats(user: User = Depends(read_user), session: AsyncSession = Depends(get_session)):
+@router.get("/dashboard", response_model=DashboardStats, dependencies=[Depends(STATISTICS_ETAG)])
+async def get_dashboard_stats(user: User = Depends(read_user), session: AsyncSession = Depends(get_session), redis_client = Depends(get_redis_client)):
     today = date.today()
     start_date = date(today.year, today.month, 1)
 
+    cached, version = await get_cached_dashboard(user.id, start_date, redis_client)
+    if cached:
+        return cached
+
     query = select(
-        func.sum(case((Transaction.type == "income", Transaction.amount), else_=0)),
-        func.sum(case((Transaction.type == "expense", Transaction.amount), else_=0)),
+        func.sum(case((DailyRollup.type == "income", DailyRollup.total), else_=0)),
+        func.sum(case((DailyRollup.type == "expense", DailyRollup.total), else_=0)),
         func.sum(case(
-            (and_(Transaction.type == 'income', Transaction.date >= start_date), Transaction.amount),
+            (and_(DailyRollup.type == 'income', DailyRollup.day >= start_date), DailyRollup.total),
             else_=0
         )),
         func.sum(case(
-            (and_(Transaction.type == 'expense', Transaction.date >= start_date), Transaction.amount),
+            (and_(DailyRollup.type == 'expense', DailyRollup.day >= start_date), DailyRollup.total),
             else_=0
         )),
-    ).where(Transaction.user_id == user.id)
+    ).where(DailyRollup.user_id == user.id)
 
     result = await session.execute(query)
     total_income, total_expense, month_income, month_expense = result.one()
@@ -43,28 +56,35 @@ async def get_dashboard_stats(user: User = Depends(read_user), session: AsyncSes
 
     current_balance = total_income - total_expense
 
-    return DashboardStats(
+    stats = DashboardStats(
         current_balance=current_balance,
         last_month_income=month_income,
         last_month_expenses=month_expense
     )
+    await cache_dashboard(user.id, start_date, version, stats, redis_client)
+
+    return stats
 
-@router.get("/categories", response_model=list[CategoryStat])
+@router.get("/categories", response_model=list[CategoryStat], dependencies=[Depends(STATISTICS_ETAG)])
 async def get_stats_by_categories(
-        start_date: date = date.today() - timedelta(days=7),
-        end_date: date = date.today(),
+        response: Response,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
         user: User = Depends(read_user),
         session: AsyncSession = Depends(get_session)
-) -> list[CategoryStat]:
+):
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=7)
+
     query = (
-        select(Category, func.sum(Transaction.amount))
-        .join(Transaction.category)
+        select(Category.name, Category.color, Category.icon, Category.id, Category.user_id, func.sum(DailyRollup.total).label("total"))
+        .join(Category, Category.id == DailyRollup.category_id)
         .where(
             and_(
-                Transaction.user_id == user.id,
-                func.date(Transaction.date) >= start_date,
-                func.date(Transaction.date) <= end_date,
-                Transaction.type == "expense",
+                DailyRollup.user_id == user.id,
+                DailyRollup.day >= start_date,
+                DailyRollup.day < end_date + timedelta(days=1),
+                DailyRollup.type == "expense",
 
                 or_(
                     Category.user_id == None,
@@ -78,61 +98,108 @@ async def get_stats_by_categories(
     result = await session.execute(query)
     rows = result.all()
 
-    total_sum = sum(float(row[1]) for row in rows)
+    total_sum = sum(float(row.total) for row in rows)
 
     stats = []
-    for category_obj, amount in rows:
-        amount = float(amount or 0)
-        percent = round((amount / total_sum) * 100, 1) if total_sum > 0 else 0
-
-        stats.append(CategoryStat(
-            category=category_obj,
-            total_amount=amount,
-            percentage=percent
-        ))
-
-    return stats
-
-
-@router.get("/history", response_model=list[DailyStat])
+    for row in rows:
+        amount = float(row.total or 0)
+        percent = round((amount / total_sum) * 100, 1) if total_sum > 0 else 0.0
+
+        stats.append({
+            "category": {
+                "name": row.name,
+                "color": row.color,
+                "icon": row.icon,
+                "id": row.id,
+                "user_id": row.user_id,
+            },
+            "total_amount": amount,
+            "percentage": percent,
+        })
+
+    return fast_json(stats, response)
+
+
+@router.get("/history", response_model=list[DailyStat], dependencies=[Depends(STATISTICS_ETAG)], responses={
+    status.HTTP_400_BAD_REQUEST: {"description": "Unknown time zone"},
+})
 async def get_stats_by_history(
-        start_date: date = date.today() - timedelta(days=7),
-        end_date: date = date.today(),
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        granularity: Literal["day", "week", "month"] = "day",
+        tz: str = "UTC",
         user: User = Depends(read_user),
         session: AsyncSession = Depends(get_session)
 ):
-    stmt = (
+    """
+    Income and expense totals per day, week or month, including empty periods.
+
+    Periods are built in `tz`. UTC is served from the daily rollup, other zones aggregate the
+    transactions of the requested range directly.
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=7)
+
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown time zone")
+
+    dialect = session.bind.dialect.name
+
+    if zone.key == "UTC":
+        period = bucket(DailyRollup.day, granularity, dialect)
+        trans_type, amount = DailyRollup.type, DailyRollup.total
+        filters = [
+            DailyRollup.user_id == user.id,
+            DailyRollup.day >= start_date,
+            DailyRollup.day < end_date + timedelta(days=1),
+        ]
+    else:
+        range_start, range_end = local_range(start_date, end_date, zone)
+        period = bucket(local_time(Transaction.date, zone, dialect), granularity, dialect)
+        trans_type, amount = Transaction.type, Transaction.amount
+        filters = [
+            Transaction.user_id == user.id,
+            Transaction.date >= range_start,
+            Transaction.date < range_end,
+        ]
+
+    totals = (
         select(
-            func.date(Transaction.date).label("day"),
-            Transaction.type,
-            func.sum(Transaction.amount).label("total")
+            period.label("bucket"),
+            func.sum(case((trans_type == "income", amount), else_=0)).label("income"),
+            func.sum(case((trans_type == "expense", amount), else_=0)).label("expense"),
         )
-        .where(
-            and_(
-                Transaction.user_id == user.id,
-                func.date(Transaction.date) >= start_date,
-                func.date(Transaction.date) <= end_date
-            )
+        .where(*filters)
+        .group_by("bucket")
+        .subquery("totals")
+    )
+    series = bucket_series(
+        truncate_date(start_date, granularity),
+        truncate_date(end_date, granularity),
+        granularity,
+        dialect,
+    )
+
+    stmt = (
+        select(
+            series.c.bucket,
+            func.coalesce(totals.c.income, 0),
+            func.coalesce(totals.c.expense, 0),
         )
-        .group_by(func.date(Transaction.date), Transaction.type)
-        .order_by(func.date(Transaction.date))
+        .select_from(series.outerjoin(totals, totals.c.bucket == series.c.bucket))
+        .order_by(series.c.bucket)
     )
 
     result = await session.execute(stmt)
-    data = result.all()
-
-    stats_map = {}
-    current_date = start_date
-    while current_date <= end_date:
-        stats_map[current_date] = {"date": current_date, "income": 0, "expense": 0}
-        current_date += timedelta(days=1)
 
-    for day, trans_type, total in data:
+    stats = []
+    for day, income, expense in result.all():
 
         if isinstance(day, str):
             day = datetime.strptime(day, "%Y-%m-%d").date()
 
-        if day in stats_map:
-            stats_map[day][trans_type] = total
+        stats.append(DailyStat(date=day, income=income, expense=expense))
 
-    return list(stats_map.values())
\ No newline at end of file
+    return stats
@@ -0,0 +1,133 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, DateTime, cast, delete, func, literal, literal_column, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.statistics.models import DailyRollup
+from src.transactions.models import Transaction
+
+
+GRANULARITY_STEPS = {"day": "+1 day", "week": "+7 days", "month": "+1 month"}
+
+
+def rollup_day(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+def _insert(session: AsyncSession):
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(DailyRollup)
+    return sqlite.insert(DailyRollup)
+
+async def apply_rollup_delta(
+        session: AsyncSession,
+        user_id: int,
+        day: date,
+        type: str,
+        category_id: int | None,
+        amount: float,
+        count: int,
+):
+    """Adds `amount`/`count` to the rollup row, creating it if needed. Runs in the caller's transaction."""
+    stmt = _insert(session).values(
+        user_id=user_id,
+        day=day,
+        type=type,
+        category_id=category_id,
+        total=amount,
+        count=count,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day", "type", "category_id"],
+        set_={
+            "total": DailyRollup.total + stmt.excluded.total,
+            "count": DailyRollup.count + stmt.excluded.count,
+        },
+    )
+    await session.execute(stmt)
+
+async def add_to_rollup(session: AsyncSession, transaction: Transaction):
+    await apply_rollup_delta(
+        session, transaction.user_id, rollup_day(transaction.date), transaction.type,
+        transaction.category_id, float(transaction.amount), 1,
+    )
+
+async def remove_from_rollup(session: AsyncSession, transaction: Transaction):
+    await apply_rollup_delta(
+        session, transaction.user_id, rollup_day(transaction.date), transaction.type,
+        transaction.category_id, -float(transaction.amount), -1,
+    )
+
+async def add_many_to_rollup(session: AsyncSession, user_id: int, transactions: list[dict]):
+    """Collapses a batch of new rows into one upsert per (day, type, category)."""
+    deltas: dict[tuple[date, str, int | None], list] = {}
+
+    for transaction in transactions:
+        key = (rollup_day(transaction["date"]), transaction["type"], transaction["category_id"])
+        delta = deltas.setdefault(key, [0.0, 0])
+        delta[0] += float(transaction["amount"])
+        delta[1] += 1
+
+    for (day, type, category_id), (amount, count) in deltas.items():
+        await apply_rollup_delta(session, user_id, day, type, category_id, amount, count)
+
+async def move_rollup_category(session: AsyncSession, category_id: int, new_category_id: int):
+    result = await session.execute(select(DailyRollup).where(DailyRollup.category_id == category_id))
+    rows = result.scalars().all()
+
+    for row in rows:
+        await apply_rollup_delta(session, row.user_id, row.day, row.type, new_category_id, row.total, row.count)
+
+    await session.execute(delete(DailyRollup).where(DailyRollup.category_id == category_id))
+
+def truncate_date(value: date, granularity: str) -> date:
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+def local_range(start_date: date, end_date: date, tz: ZoneInfo) -> tuple[datetime, datetime]:
+    """Half-open `[start, end)` timestamp range covering whole local days, usable by an index on `date`."""
+    start = datetime.combine(start_date, time.min, tzinfo=tz)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+def local_time(column, tz: ZoneInfo, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.timezone(tz.key, column)
+
+    # SQLite has no time zone database, so the current UTC offset of the zone is applied.
+    offset = datetime.now(tz).utcoffset() or timedelta()
+    return func.datetime(column, f"{int(offset.total_seconds() // 60):+d} minutes")
+
+def bucket(column, granularity: str, dialect_name: str):
+    """Start date of the day / week (Monday) / month that `column` falls into."""
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(granularity, column), Date)
+
+    if granularity == "week":
+        return func.date(column, "-6 days", "weekday 1")
+    if granularity == "month":
+        return func.date(column, "start of month")
+    return func.date(column)
+
+def bucket_series(start: date, end: date, granularity: str, dialect_name: str):
+    """Every bucket start between `start` and `end` inclusive, as a subquery with a `bucket` column."""
+    if dialect_name == "postgresql":
+        series = func.generate_series(
+            cast(literal(start), DateTime),
+            cast(literal(end), DateTime),
+            literal_column(f"interval '1 {granularity}'"),
+        )
+        return select(cast(series, Date).label("bucket")).subquery("buckets")
+
+    buckets = select(func.date(literal(start.isoformat())).label("bucket")).cte("buckets", recursive=True)
+    buckets = buckets.union_all(
+        select(func.date(buckets.c.bucket, GRANULARITY_STEPS[granularity]))
+        .where(buckets.c.bucket < end.isoformat())
+    )
+    return select(buckets.c.bucket).subquery("series")
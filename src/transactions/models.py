@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Integer, ForeignKey, String, DateTime, Float
+from sqlalchemy import Integer, ForeignKey, String, DateTime, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.categories.models import Category
+from src.recurring.models import RecurringTransaction
 from src.database import Base
 
 
@@ -15,6 +16,7 @@ class Transaction(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = mapped_column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    recurring_id = mapped_column(Integer, ForeignKey("recurring_transactions.id", ondelete="SET NULL"), nullable=True)
 
     type: Mapped[str] = mapped_column(String, nullable=False)
     name: Mapped[str] = mapped_column(String, nullable=False)
@@ -24,3 +26,31 @@ class Transaction(Base):
 
     user: Mapped[User] = relationship(back_populates="transactions")
     category: Mapped[Category] = relationship("Category", back_populates="transactions")
+
+
+Index(
+    "ix_transactions_user_id_date_id",
+    Transaction.user_id,
+    Transaction.date.desc(),
+    Transaction.id.desc(),
+)
+
+Index("ix_transactions_user_id_category_id_date", Transaction.user_id, Transaction.category_id, Transaction.date)
+Index("ix_transactions_user_id_type_date", Transaction.user_id, Transaction.type, Transaction.date)
+
+# One transaction per occurrence of a recurring rule, which keeps the generator idempotent.
+Index(
+    "ix_transactions_recurring_id_date",
+    Transaction.recurring_id,
+    Transaction.date,
+    unique=True,
+    postgresql_where=Transaction.recurring_id.is_not(None),
+    sqlite_where=Transaction.recurring_id.is_not(None),
+)
+
+Index(
+    "ix_transactions_name_trgm",
+    Transaction.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
@@ -1,56 +1,216 @@
+import io
+from math import ceil
+from types import SimpleNamespace
 from typing import Optional, Literal
+from datetime import date, datetime, time, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_
+from sqlalchemy import func, tuple_, insert, update, delete, literal, or_, and_
 from sqlalchemy.orm import joinedload
 
-from fastapi_pagination import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
+from fastapi_pagination import Page, Params
 
 from src.transactions.models import Transaction
 from src.categories.models import Category
 from src.auth.models import User
-from src.transactions.schemas import TransactionCreate, TransactionOut, TransactionUpdate
+from src.transactions.schemas import TransactionCreate, TransactionBatchCreate, TransactionOut, TransactionUpdate, TransactionCursorPage, TransactionImportResult, ImportRowError
+from src.transactions.utils import encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor, search_terms, iter_import_rows, next_import_batch, export_chunks, MAX_IMPORT_ERRORS, EXPORT_BATCH_SIZE
+from src.statistics.utils import add_to_rollup, remove_from_rollup, add_many_to_rollup
+from src.statistics.cache import bump_stats_version, version_key as stats_version_key
+from src.categories.cache import get_available_categories, version_key as categories_version_key
+from src.etag import conditional_get
+from src.responses import fast_json
+from src.rate_limit import rate_limit
+from src.config import settings
+from src.redis_utils import get_redis_client
 from src.database import get_session
 from src.auth.depends import read_user
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+ROLLUP_COLUMNS = (Transaction.user_id, Transaction.type, Transaction.amount, Transaction.category_id, Transaction.date)
+RETURNED_COLUMNS = (Transaction.id, Transaction.name, *ROLLUP_COLUMNS)
+LIST_COLUMNS = (
+    Transaction.id, Transaction.type, Transaction.name, Transaction.amount, Transaction.date,
+    Category.id.label("category_id"), Category.name.label("category_name"), Category.color.label("category_color"),
+    Category.icon.label("category_icon"), Category.user_id.label("category_user_id"),
+)
+# Listings embed category names, so category edits must change the tag as well.
+TRANSACTIONS_ETAG = conditional_get(stats_version_key, categories_version_key)
+WRITE_LIMIT = rate_limit("write", ip=settings.RATE_LIMIT_WRITE_IP)
 
-@router.get('/', response_model=Page[TransactionOut])
-async def get_transactions(
+
+def _transaction_filters(
         transaction_type: Optional[Literal["expense", "income"]] = Query(None),
+        start_date: Optional[date] = Query(None, description="First day to include (UTC)"),
+        end_date: Optional[date] = Query(None, description="Last day to include (UTC)"),
+        category_id: Optional[list[int]] = Query(None, description="Repeat to match any of several categories"),
+        min_amount: Optional[float] = Query(None, ge=0),
+        max_amount: Optional[float] = Query(None, ge=0),
+) -> list:
+    """Query parameters shared by the list endpoints, as `WHERE` conditions that keep to the `(user_id, ...)` indexes."""
+    filters = []
+
+    if transaction_type:
+        filters.append(Transaction.type == transaction_type)
+    if start_date:
+        filters.append(Transaction.date >= datetime.combine(start_date, time.min, tzinfo=timezone.utc))
+    if end_date:
+        filters.append(Transaction.date < datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc))
+    if category_id:
+        filters.append(Transaction.category_id.in_(category_id))
+    if min_amount is not None:
+        filters.append(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        filters.append(Transaction.amount <= max_amount)
+
+    return filters
+
+@router.get('/', response_model=Page[TransactionOut], dependencies=[Depends(TRANSACTIONS_ETAG)])
+async def get_transactions(
+        response: Response,
+        params: Params = Depends(),
+        filters: list = Depends(_transaction_filters),
+        q: Optional[str] = Query(None, min_length=1, max_length=100),
         session: AsyncSession = Depends(get_session),
         user: User = Depends(read_user)
 ):
-    stmt = (select(Transaction)
-            .options(joinedload(Transaction.category))
-            .where(Transaction.user_id == user.id)
-            .order_by(Transaction.date.desc())
+    filters = [Transaction.user_id == user.id, *filters]
+
+    stmt = (select(*LIST_COLUMNS)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .limit(params.size)
+            .offset((params.page - 1) * params.size)
             )
 
-    if transaction_type:
-        stmt = stmt.where(Transaction.type == transaction_type)
+    if q:
+        condition, rank = search_terms(session, q)
+        filters.append(condition)
+        stmt = stmt.order_by(rank.desc())
+
+    stmt = stmt.where(*filters).order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    total = await session.scalar(select(func.count()).select_from(Transaction).where(*filters))
+    rows = (await session.execute(stmt)).all()
+
+    return fast_json({
+        "items": [_transaction_json(row) for row in rows],
+        "total": total,
+        "page": params.page,
+        "size": params.size,
+        "pages": ceil(total / params.size),
+    }, response)
 
-    return await paginate(session, stmt)
+@router.get("/cursor", response_model=TransactionCursorPage, dependencies=[Depends(TRANSACTIONS_ETAG)], responses={
+    status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
+})
+async def get_transactions_by_cursor(
+        response: Response,
+        cursor: Optional[str] = Query(None),
+        size: int = Query(50, ge=1, le=100),
+        include_total: bool = Query(False),
+        filters: list = Depends(_transaction_filters),
+        q: Optional[str] = Query(None, min_length=1, max_length=100),
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user)
+):
+    """
+    Keyset pagination over `(date, id)`.
+
+    Every page is a single index range scan, so deep pages cost the same as the first one.
+    Pass `next_cursor` from the previous response to get the next page.
+    The total count is only calculated when `include_total` is set.
+
+    With `q`, only transactions whose name matches are returned, best matches first,
+    and the cursor also carries the rank.
+    """
+    filters = [Transaction.user_id == user.id, *filters]
+
+    if q:
+        condition, rank = search_terms(session, q)
+        filters.append(condition)
+    else:
+        rank = literal(0.0)
+
+    stmt = (select(*LIST_COLUMNS, rank.label("rank"))
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(*filters)
+            .limit(size + 1)
+            )
 
-@router.post("/", response_model=TransactionOut)
+    if q:
+        stmt = stmt.order_by(rank.desc(), Transaction.date.desc(), Transaction.id.desc())
+    else:
+        stmt = stmt.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    if cursor and q:
+        last_rank, last_date, last_id = decode_search_cursor(cursor)
+        stmt = stmt.where(or_(
+            rank < last_rank,
+            and_(rank == last_rank, tuple_(Transaction.date, Transaction.id) < (last_date, last_id)),
+        ))
+    elif cursor:
+        last_date, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Transaction.date, Transaction.id) < (last_date, last_id))
+
+    result = await session.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        if q:
+            next_cursor = encode_search_cursor(last.rank, last.date, last.id)
+        else:
+            next_cursor = encode_cursor(last.date, last.id)
+
+    total = None
+    if include_total:
+        total = await session.scalar(select(func.count()).select_from(Transaction).where(*filters))
+
+    return fast_json({
+        "items": [_transaction_json(row) for row in rows],
+        "next_cursor": next_cursor,
+        "total": total,
+    }, response)
+
+def _transaction_json(row) -> dict:
+    """`TransactionOut` as a plain dict, built from a `LIST_COLUMNS` row."""
+    category = None
+    if row.category_id is not None:
+        category = {
+            "name": row.category_name,
+            "color": row.category_color,
+            "icon": row.category_icon,
+            "id": row.category_id,
+            "user_id": row.category_user_id,
+        }
+
+    return {
+        "id": row.id,
+        "type": row.type,
+        "name": row.name,
+        # Decimal fields are serialized as strings.
+        "amount": str(row.amount),
+        "date": row.date,
+        "category": category,
+    }
+
+@router.post("/", response_model=TransactionOut, dependencies=[Depends(WRITE_LIMIT)])
 async def create_transaction(
         payload: TransactionCreate,
         session: AsyncSession = Depends(get_session),
-        user: User = Depends(read_user)
+        user: User = Depends(read_user),
+        redis_client = Depends(get_redis_client)
 ):
-    query = select(Category).where(
-        Category.id == payload.category_id,
-        or_(
-            Category.user_id == user.id,
-            Category.user_id.is_(None)
-        )
-    )
-    result = await session.execute(query)
-    category = result.scalar_one_or_none()
+    categories = await get_available_categories(user.id, session, redis_client)
+    category = categories.get(payload.category_id)
 
     if not category:
         raise HTTPException(
@@ -64,13 +224,167 @@ async def create_transaction(
     )
 
     session.add(new_transaction)
+    await add_to_rollup(session, new_transaction)
     await session.commit()
+    await bump_stats_version(user.id, redis_client)
 
-    await session.refresh(new_transaction, attribute_names=["category"])
+    return TransactionOut(
+        **payload.model_dump(exclude={"category_id"}),
+        id=new_transaction.id,
+        category=category
+    )
 
-    return new_transaction
+@router.post("/batch", response_model=list[TransactionOut], dependencies=[Depends(WRITE_LIMIT)], responses={
+    status.HTTP_404_NOT_FOUND: {"description": "Some categories were not found or you don't have access to them"},
+})
+async def create_transactions_batch(
+        payload: TransactionBatchCreate,
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user),
+        redis_client = Depends(get_redis_client)
+):
+    """
+    Creates several transactions at once, e.g. when a client replays an offline queue.
+
+    All items are inserted in one statement and one DB transaction: either every item is created or none.
+    """
+    categories = await get_available_categories(user.id, session, redis_client)
+
+    missing_ids = sorted({item.category_id for item in payload.items} - categories.keys())
+    if missing_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Categories not found or you don't have access to them: {missing_ids}"
+        )
 
-@router.get("/{transaction_id}", response_model=TransactionOut)
+    values = [{**item.model_dump(), "user_id": user.id} for item in payload.items]
+
+    result = await session.execute(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        values
+    )
+    ids = result.scalars().all()
+
+    await add_many_to_rollup(session, user.id, values)
+    await session.commit()
+    await bump_stats_version(user.id, redis_client)
+
+    return [
+        TransactionOut(
+            **item.model_dump(exclude={"category_id"}),
+            id=transaction_id,
+            category=categories[item.category_id]
+        )
+        for transaction_id, item in zip(ids, payload.items)
+    ]
+
+@router.post("/import", response_model=TransactionImportResult, dependencies=[Depends(WRITE_LIMIT)])
+async def import_transactions(
+        file: UploadFile,
+        format: Literal["csv", "ndjson"] = Query("csv"),
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user),
+        redis_client = Depends(get_redis_client)
+):
+    """
+    Imports transactions from a CSV file (header: `type,name,amount,category_id,date`)
+    or from NDJSON (one `TransactionCreate` object per line).
+
+    The file is read and written in batches, each batch is committed separately.
+    Rows that fail validation are skipped and reported in `errors`.
+    """
+    categories = await get_available_categories(user.id, session, redis_client)
+
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    rows = iter_import_rows(text, format)
+    report = TransactionImportResult()
+
+    try:
+        while batch := await run_in_threadpool(next_import_batch, rows):
+            await _import_batch(batch, categories.keys(), report, session, user)
+    finally:
+        text.detach()
+        # Earlier batches stay committed even if a later one fails.
+        if report.imported:
+            await bump_stats_version(user.id, redis_client)
+
+    return report
+
+async def _import_batch(batch: list, allowed_ids, report: TransactionImportResult, session: AsyncSession, user: User):
+    def add_error(row_number: int, error: str):
+        report.failed += 1
+        if len(report.errors) < MAX_IMPORT_ERRORS:
+            report.errors.append(ImportRowError(row=row_number, error=error))
+
+    parsed = []
+    for row_number, data, error in batch:
+        if error:
+            add_error(row_number, error)
+            continue
+
+        try:
+            parsed.append((row_number, TransactionCreate.model_validate(data)))
+        except ValidationError as e:
+            first = e.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            add_error(row_number, f"{location}: {first['msg']}" if location else first["msg"])
+
+    values = []
+    for row_number, item in parsed:
+        if item.category_id not in allowed_ids:
+            add_error(row_number, "Category not found or you don't have access to it")
+            continue
+
+        values.append({**item.model_dump(), "user_id": user.id})
+
+    if not values:
+        return
+
+    await session.execute(insert(Transaction), values)
+    await add_many_to_rollup(session, user.id, values)
+    await session.commit()
+
+    report.imported += len(values)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_transactions(
+        format: Literal["csv", "ndjson"] = Query("csv"),
+        gzip: bool = Query(False),
+        session: AsyncSession = Depends(get_session),
+        user: User = Depends(read_user)
+):
+    """
+    Streams all user's transactions as CSV or NDJSON, optionally gzip-compressed.
+
+    Rows are read from a server-side cursor in batches, so the whole history is never held in memory.
+    """
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.type,
+            Transaction.name,
+            Transaction.amount,
+            Transaction.category_id,
+            Category.name.label("category"),
+            Transaction.date,
+        )
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user.id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    result = await session.stream(stmt)
+
+    filename = f"transactions.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson")
+
+    return StreamingResponse(
+        export_chunks(result.partitions(), format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/{transaction_id}", response_model=TransactionOut, dependencies=[Depends(TRANSACTIONS_ETAG)])
 async def get_transaction(transaction_id: int, session: AsyncSession = Depends(get_session), user: User = Depends(read_user)):
     query = (
         select(Transaction).where(Transaction.id == transaction_id)
@@ -87,61 +401,100 @@ async def get_transaction(transaction_id: int, session: AsyncSession = Depends(g
 
     return transaction
 
-@router.patch("/{transaction_id}", response_model=TransactionOut, responses={
+@router.patch("/{transaction_id}", response_model=TransactionOut, dependencies=[Depends(WRITE_LIMIT)], responses={
     status.HTTP_403_FORBIDDEN: {"description": "You cannot edit other users' transactions"},
     status.HTTP_404_NOT_FOUND: {"description": "Transaction does not exist"},
 })
-async def update_transaction(transaction_id: int, payload: TransactionUpdate, session: AsyncSession = Depends(get_session), user: User = Depends(read_user)):
-    query = (
-        select(Transaction)
-        .options(joinedload(Transaction.category))
-        .where(Transaction.id == transaction_id)
-    )
-    result = await session.execute(query)
-    transaction = result.scalar_one_or_none()
-
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-
-    if not transaction.user_id == user.id:
-        raise HTTPException(status_code=403, detail="You cannot edit other users' transactions")
-
+async def update_transaction(transaction_id: int, payload: TransactionUpdate, session: AsyncSession = Depends(get_session), user: User = Depends(read_user), redis_client = Depends(get_redis_client)):
+    categories = await get_available_categories(user.id, session, redis_client)
+    update_data = payload.model_dump(exclude_unset=True)
 
-    if payload.category_id is not None:
+    if payload.category_id is not None and payload.category_id not in categories:
+        # The row must be the user's first, so a foreign or missing id never reveals who owns a category.
+        await _check_owner(session, transaction_id, user.id, "You cannot edit other users' transactions")
         new_category = await session.get(Category, payload.category_id)
 
         if not new_category:
             raise HTTPException(status_code=404, detail="New category not found")
 
-        if new_category.user_id is not None and new_category.user_id != user.id:
-            raise HTTPException(status_code=403, detail="You cannot assign a category that belongs to another user")
+        raise HTTPException(status_code=403, detail="You cannot assign a category that belongs to another user")
 
-    update_data = payload.model_dump(exclude_unset=True)
+    rows = await _update_returning(session, transaction_id, user.id, update_data)
 
-    for key, value in update_data.items():
-        setattr(transaction, key, value)
+    if not rows:
+        await _check_owner(session, transaction_id, user.id, "You cannot edit other users' transactions")
 
+    old, updated = rows
+
+    await remove_from_rollup(session, old)
+    await add_to_rollup(session, updated)
     await session.commit()
-    result = await session.execute(
-        select(Transaction)
-        .options(joinedload(Transaction.category))
-        .where(Transaction.id == transaction_id)
+    await bump_stats_version(user.id, redis_client)
+
+    return TransactionOut(
+        id=updated.id,
+        type=updated.type,
+        name=updated.name,
+        amount=updated.amount,
+        date=updated.date,
+        category=categories.get(updated.category_id)
     )
-    updated_transaction = result.scalar_one()
 
-    return updated_transaction
+@router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(WRITE_LIMIT)])
+async def delete_transaction(transaction_id: int, session: AsyncSession = Depends(get_session), user: User = Depends(read_user), redis_client = Depends(get_redis_client)):
+    stmt = (
+        delete(Transaction)
+        .where(Transaction.id == transaction_id, Transaction.user_id == user.id)
+        .returning(*ROLLUP_COLUMNS)
+    )
+    result = await session.execute(stmt)
+    deleted = result.one_or_none()
 
-@router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_transaction(transaction_id: int, session: AsyncSession = Depends(get_session), user: User = Depends(read_user)):
-    transaction = await session.get(Transaction, transaction_id)
+    if not deleted:
+        await _check_owner(session, transaction_id, user.id, "You cannot delete other users' transactions")
 
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    await remove_from_rollup(session, deleted)
+    await session.commit()
+    await bump_stats_version(user.id, redis_client)
+
+    return
+
+async def _update_returning(session: AsyncSession, transaction_id: int, user_id: int, values: dict):
+    """
+    Updates the user's transaction and returns its `(old, new)` rows, or `None` if no row matched.
+
+    On Postgres this is one `WITH old AS (... FOR UPDATE) UPDATE ... FROM old RETURNING` statement.
+    SQLite cannot return columns of the FROM clause, so there the old row is selected first.
+    """
+    owned = (Transaction.id == transaction_id, Transaction.user_id == user_id)
+
+    if session.bind.dialect.name == "postgresql":
+        old = select(*ROLLUP_COLUMNS, Transaction.id).where(*owned).with_for_update().cte("old")
+        stmt = (
+            update(Transaction)
+            .where(Transaction.id == old.c.id)
+            .values(**values)
+            .returning(*RETURNED_COLUMNS, *(column.label(f"old_{column.name}") for column in old.c if column.name != "id"))
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        if not row:
+            return None
 
-    if not transaction.user_id == user.id:
-        raise HTTPException(status_code=403, detail="You cannot delete other users' transactions")
+        old_row = SimpleNamespace(**{column.name: getattr(row, f"old_{column.name}") for column in ROLLUP_COLUMNS})
+        return old_row, row
 
-    await session.delete(transaction)
-    await session.commit()
+    old_row = (await session.execute(select(*ROLLUP_COLUMNS).where(*owned))).one_or_none()
+    if not old_row:
+        return None
+
+    stmt = update(Transaction).where(*owned).values(**values).returning(*RETURNED_COLUMNS)
+    return old_row, (await session.execute(stmt)).one()
+
+async def _check_owner(session: AsyncSession, transaction_id: int, user_id: int, forbidden_detail: str):
+    owner_id = await session.scalar(select(Transaction.user_id).where(Transaction.id == transaction_id))
+
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
 
-    return
\ No newline at end of file
+    if owner_id != user_id:
+        raise HTTPException(status_code=403, detail=forbidden_detail)
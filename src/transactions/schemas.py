@@ -6,6 +6,9 @@ from pydantic import BaseModel, ConfigDict, model_validator, Field
 from src.categories.schemas import CategoryRead
 
 
+MAX_BATCH_SIZE = 500
+
+
 class TransactionCreate(BaseModel):
     type: Literal["income", "expense"] = "expense"
     name: str
@@ -14,6 +17,10 @@ class TransactionCreate(BaseModel):
     date: datetime
 
 
+class TransactionBatchCreate(BaseModel):
+    items: list[TransactionCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 class TransactionOut(BaseModel):
     id: int
     type: str
@@ -30,6 +37,20 @@ class TransactionOut(BaseModel):
     #         self.amount = -self.amount
     #     return self
 
+class TransactionCursorPage(BaseModel):
+    items: list[TransactionOut]
+    next_cursor: str | None = None
+    total: int | None = None
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class TransactionImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+
 class TransactionUpdate(BaseModel):
     type: Literal["income", "expense"]
     name: str | None = Field(None, min_length=2, max_length=50)
@@ -0,0 +1,153 @@
+import base64
+import csv
+import io
+import itertools
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Iterator, TextIO
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.transactions.models import Transaction
+
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ("id", "type", "name", "amount", "category_id", "category", "date")
+
+
+def encode_cursor(date: datetime, transaction_id: int) -> str:
+    raw = json.dumps({"d": date.isoformat(), "i": transaction_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["d"]), int(raw["i"])
+
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def encode_search_cursor(rank: float, date: datetime, transaction_id: int) -> str:
+    raw = json.dumps({"r": rank, "d": date.isoformat(), "i": transaction_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_search_cursor(cursor: str) -> tuple[float, datetime, int]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(raw["r"]), datetime.fromisoformat(raw["d"]), int(raw["i"])
+
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def search_terms(session: AsyncSession, q: str):
+    """
+    Match condition and rank for `q` over transaction names.
+
+    Postgres matches substrings and near-misses (`<%` word similarity), both served by the trigram index,
+    and ranks by word similarity. Elsewhere it falls back to LIKE, ranking exact and prefix matches first.
+    """
+    if session.bind.dialect.name == "postgresql":
+        condition = or_(Transaction.name.icontains(q, autoescape=True), literal(q).op("<%")(Transaction.name))
+        return condition, func.word_similarity(q, Transaction.name)
+
+    rank = case(
+        (func.lower(Transaction.name) == q.lower(), 1.0),
+        (Transaction.name.istartswith(q, autoescape=True), 0.5),
+        else_=0.0,
+    )
+    return Transaction.name.icontains(q, autoescape=True), rank
+
+def iter_import_rows(text: TextIO, format: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Yields `(row_number, data, error)` without reading the whole file into memory.
+
+    `text` must decode with `errors="surrogateescape"`, so a row with bytes that are not UTF-8 is
+    reported on its own instead of aborting the import. A CSV the parser cannot continue past ends
+    the rows with an error for the row it failed on.
+    """
+    if format == "csv":
+        row_number = 1
+        try:
+            for row in csv.DictReader(text):
+                row_number += 1
+                if not _is_utf8(value for value in row.values() if isinstance(value, str)):
+                    yield row_number, None, "Row is not valid UTF-8"
+                else:
+                    yield row_number, row, None
+        except csv.Error as e:
+            yield row_number + 1, None, f"Invalid CSV, import stopped: {e}"
+        return
+
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+
+        if not _is_utf8([line]):
+            yield row_number, None, "Row is not valid UTF-8"
+            continue
+
+        try:
+            yield row_number, json.loads(line), None
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+
+def _is_utf8(values) -> bool:
+    # Undecodable bytes come through as lone surrogates, which cannot be encoded back.
+    try:
+        "".join(values).encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+def next_import_batch(rows: Iterator, size: int = IMPORT_BATCH_SIZE) -> list:
+    return list(itertools.islice(rows, size))
+
+def format_export_rows(rows, format: str) -> str:
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row.id, row.type, row.name, row.amount, row.category_id, row.category, row.date.isoformat()])
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps({
+            "id": row.id,
+            "type": row.type,
+            "name": row.name,
+            "amount": row.amount,
+            "category_id": row.category_id,
+            "category": row.category,
+            "date": row.date.isoformat(),
+        }, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+async def export_chunks(partitions: AsyncIterator, format: str, compress: bool) -> AsyncIterator[bytes]:
+    """Encodes the result partition by partition, optionally through a streaming gzip compressor."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if format == "csv":
+        yield encode(",".join(EXPORT_FIELDS) + "\r\n")
+
+    async for rows in partitions:
+        chunk = encode(format_export_rows(rows, format))
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
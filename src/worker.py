@@ -1,40 +1,114 @@
-from faststream import FastStream
-import resend
-
-from src.config import settings
-from src.mq import broker
-
-app = FastStream(broker)
-
-resend.api_key = settings.RESEND_API
-
-
-@broker.subscriber("verification")
-async def handle_email(msg: dict):
-    if "code" in msg:
-        params = {
-            "from": "noreply@x0ryz.cc",
-            "to": msg["email"],
-            "subject": "Your Verification Code",
-            "html": f"<p>Code: <strong>{msg['code']}</strong></p>"
-        }
-
-    elif "token" in msg:
-        reset_link = f"https://x0ryz.cc/reset?token={msg['token']}"
-
-        params = {
-            "from": "noreply@x0ryz.cc",
-            "to": [msg["email"]],
-            "subject": "Reset Your Password",
-            "html": f"""
-                        <p>Click the link below to reset your password:</p>
-                        <a href="{reset_link}">Reset Password</a>
-                        <p>Link expires in 15 minutes.</p>
-                    """
-        }
-
-    try:
-        email = resend.Emails.send(params)
-        print(f"Email sent to {msg['email']}: {email}")
-    except Exception as e:
-        print(f"Error sending email: {e}")
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from faststream import AckPolicy, FastStream
+from faststream.rabbit import Channel, RabbitQueue
+from faststream.rabbit.annotations import RabbitMessage
+
+from src import redis_utils
+from src.auth.models import User  # noqa: F401, the Transaction and Category mappers refer to it
+from src.config import settings
+from src.database import async_session
+from src.mail import deliver, get_transport
+from src.mq import broker, publish
+from src.recurring.utils import generate_due_transactions
+from src.redis_utils import init_redis, close_redis
+from src.statistics.cache import bump_stats_version
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE = "verification"
+DEAD_LETTER_QUEUE = "verification.dlq"
+
+app = FastStream(broker)
+
+transport = get_transport()
+
+# Up to EMAIL_CONCURRENCY emails are sent at once, RabbitMQ keeps EMAIL_PREFETCH more unacked messages ready.
+_semaphore = asyncio.Semaphore(settings.EMAIL_CONCURRENCY)
+_tasks: set[asyncio.Task] = set()
+_recurring_task: asyncio.Task | None = None
+
+
+@app.after_startup
+async def declare_dead_letter_queue():
+    await broker.declare_queue(RabbitQueue(DEAD_LETTER_QUEUE, durable=True))
+
+
+@app.after_startup
+async def start_recurring_job():
+    global _recurring_task
+
+    await init_redis()
+    _recurring_task = asyncio.create_task(run_recurring_job())
+
+
+@app.on_shutdown
+async def wait_for_pending_emails():
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+
+
+@app.on_shutdown
+async def stop_recurring_job():
+    if _recurring_task:
+        _recurring_task.cancel()
+    await close_redis()
+
+
+async def generate_recurring_transactions() -> int:
+    today = datetime.now(timezone.utc).date()
+
+    async with async_session() as session:
+        created = await generate_due_transactions(session, today, settings.RECURRING_MAX_OCCURRENCES)
+        await session.commit()
+
+    for user_id in created:
+        await bump_stats_version(user_id, redis_utils.redis_client)
+    return sum(created.values())
+
+
+async def run_recurring_job():
+    while True:
+        try:
+            created = await generate_recurring_transactions()
+            if created:
+                logger.info(f"Created {created} recurring transactions")
+        except Exception as e:
+            logger.error(f"Error creating recurring transactions: {e}")
+
+        await asyncio.sleep(settings.RECURRING_JOB_INTERVAL)
+
+
+@broker.subscriber(
+    EMAIL_QUEUE,
+    channel=Channel(prefetch_count=settings.EMAIL_PREFETCH),
+    ack_policy=AckPolicy.MANUAL,
+)
+async def handle_email(msg: dict, message: RabbitMessage):
+    await _semaphore.acquire()
+
+    task = asyncio.create_task(process_email(msg, message))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def process_email(msg: dict, message) -> None:
+    try:
+        try:
+            await deliver(msg, transport, settings.EMAIL_MAX_RETRIES, settings.EMAIL_RETRY_BASE_DELAY)
+            logger.info(f"Email sent to {msg.get('email')}")
+
+        except Exception as e:
+            logger.error(f"Error sending email to {msg.get('email')}: {e}")
+            try:
+                await publish({"message": msg, "error": str(e)}, queue=DEAD_LETTER_QUEUE)
+            except Exception:
+                await message.nack(requeue=True)
+                return
+
+        await message.ack()
+
+    finally:
+        _semaphore.release()
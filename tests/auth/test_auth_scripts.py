@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src.auth.cache import cache_user
+from src.auth.models import User
+from src.auth.scripts import RESEND_BLOCK_TTL, VERIFICATION_CODE_TTL, read_refresh_token
+from src.auth.utils import create_refresh_token, get_token_hash
+from src.outbox.models import OutboxMessage
+
+EMAIL = "new@example.com"
+
+
+@pytest.fixture
+def fake_redis(lua_redis):
+    # Runs the scripts from src/auth/scripts.py themselves instead of the conftest stand-ins.
+    return lua_redis
+
+
+@pytest.fixture
+async def unverified_user(session):
+    user = User(email=EMAIL, password="hashed", is_verified=False)
+    session.add(user)
+    await session.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_resend_is_blocked_until_the_block_expires(client, fake_redis, unverified_user, session):
+    first = await client.post("/auth/resend", json={"email": EMAIL})
+    second = await client.post("/auth/resend", json={"email": EMAIL})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    messages = (await session.scalars(select(OutboxMessage.payload))).all()
+    assert [message["code"] for message in messages] == [await fake_redis.get(f"verification:{EMAIL}")]
+    assert 0 < await fake_redis.ttl(f"verification:{EMAIL}") <= VERIFICATION_CODE_TTL
+    assert 0 < await fake_redis.ttl(f"spam_block:{EMAIL}") <= RESEND_BLOCK_TTL
+
+
+@pytest.mark.asyncio
+async def test_verification_code_works_once(client, fake_redis, unverified_user):
+    await fake_redis.set(f"verification:{EMAIL}", "123456")
+
+    wrong = await client.post("/auth/verify", json={"email": EMAIL, "code": "654321"})
+    first = await client.post("/auth/verify", json={"email": EMAIL, "code": "123456"})
+    second = await client.post("/auth/verify", json={"email": EMAIL, "code": "123456"})
+
+    assert wrong.status_code == 400
+    assert first.status_code == 200
+    assert second.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_read_refresh_token_returns_the_cached_user(fake_redis, user):
+    refresh_token = await create_refresh_token(user.id, fake_redis)
+
+    assert await read_refresh_token(get_token_hash(refresh_token), fake_redis) == (str(user.id), None)
+    assert await read_refresh_token(get_token_hash("unknown"), fake_redis) == (None, None)
+
+    await cache_user(user, "0", fake_redis)
+    user_id, cached = await read_refresh_token(get_token_hash(refresh_token), fake_redis)
+    assert user_id == str(user.id)
+    assert cached is not None
+
+
+@pytest.mark.asyncio
+async def test_refresh_uses_cached_user(client, fake_redis, user, assert_max_queries):
+    refresh_token = await create_refresh_token(user.id, fake_redis)
+    await cache_user(user, "0", fake_redis)
+    client.cookies.set("user_refresh_token", refresh_token)
+
+    with assert_max_queries(0):
+        response = await client.post("/auth/refresh")
+
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+@pytest.mark.asyncio
+async def test_reset_token_works_once_under_concurrent_use(client, fake_redis, user):
+    await fake_redis.set("pwd_reset:token", user.email)
+    payload = {"token": "token", "new_password": "new-password-123"}
+
+    responses = await asyncio.gather(*(client.post("/auth/reset", json=payload) for _ in range(2)))
+
+    assert sorted(response.status_code for response in responses) == [200, 400]
+    assert await fake_redis.exists("pwd_reset:token") == 0
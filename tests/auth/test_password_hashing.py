@@ -0,0 +1,30 @@
+import pytest
+from passlib.context import CryptContext
+
+from src.auth.models import User
+from benchmarks.argon2 import calibrate_argon2
+from src.auth.utils import pwd_context
+
+USER_EMAIL = "test_rehash@example.com"
+USER_PASSWORD = "password123"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_hash(client, session):
+    weak_context = CryptContext(schemes=["argon2"], argon2__rounds=1, argon2__memory_cost=1024, argon2__parallelism=1)
+    user = User(email=USER_EMAIL, password=weak_context.hash(USER_PASSWORD), is_verified=True)
+    session.add(user)
+    await session.commit()
+
+    old_hash = user.password
+    response = await client.post("/auth/login", json={"email": USER_EMAIL, "password": USER_PASSWORD})
+
+    assert response.status_code == 200
+    await session.refresh(user)
+    assert user.password != old_hash
+    assert not pwd_context.needs_update(user.password)
+
+
+def test_calibrate_argon2_respects_bounds():
+    params = calibrate_argon2(target_ms=0, memory_cost=1024, parallelism=1)
+    assert params == {"rounds": 1, "memory_cost": 1024, "parallelism": 1}
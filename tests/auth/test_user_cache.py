@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import delete
+
+from src.auth import cache as auth_cache
+from src.auth.cache import invalidate_user
+from src.auth.models import User
+
+
+@pytest.mark.asyncio
+async def test_read_user_is_served_from_cache(client, session, user, auth_headers):
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 200
+
+    user_id = user.id
+    await session.execute(delete(User).where(User.id == user_id))
+    await session.commit()
+
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_invalidated_user_is_reloaded(client, session, fake_redis, user, auth_headers):
+    await client.get("/categories/", headers=auth_headers)
+
+    user_id = user.id
+    await session.execute(delete(User).where(User.id == user_id))
+    await session.commit()
+
+    await invalidate_user(user_id, fake_redis)
+
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers(client, session, fake_redis, user, auth_headers):
+    await client.get("/categories/", headers=auth_headers)
+
+    user_id = user.id
+    await session.execute(delete(User).where(User.id == user_id))
+    await session.commit()
+
+    # Another worker invalidates the user: this worker's local copy is left in place.
+    local_cache = auth_cache._user_cache._data.copy()
+    await invalidate_user(user_id, fake_redis)
+    auth_cache._user_cache._data.update(local_cache)
+
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_entry_cached_before_invalidation_is_ignored(client, session, fake_redis, user, auth_headers):
+    _, version = await auth_cache.get_cached_user(user.id, fake_redis)
+    user_id = user.id
+    await invalidate_user(user_id, fake_redis)
+    # A request that loaded the user before the invalidation stores it afterwards.
+    await auth_cache.cache_user(user, version, fake_redis)
+    auth_cache._user_cache.clear()
+
+    await session.execute(delete(User).where(User.id == user_id))
+    await session.commit()
+
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 401
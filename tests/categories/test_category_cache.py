@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event
+
+from src.categories.models import Category
+
+
+@pytest.fixture
+async def global_category(session):
+    category = Category(name="Продукти", user_id=None)
+    session.add_all([category, Category(name="Інше", user_id=None)])
+    await session.commit()
+    return category
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_validates_category_without_sql(client, auth_headers, db_engine, global_category):
+    await client.get("/categories/", headers=auth_headers)
+
+    statements = []
+    executed = []
+
+    def count(conn, cursor, statement, *args):
+        executed.append(statement)
+        if statement.lstrip().upper().startswith("SELECT") and "categories" in statement:
+            statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.post("/transactions/", headers=auth_headers, json={
+            "type": "expense", "name": "Milk", "amount": "40", "category_id": global_category.id, "date": "2025-01-01T10:00:00Z",
+        })
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.json()["category"]["name"] == "Продукти"
+    assert statements == []
+    assert executed
+
+
+@pytest.mark.asyncio
+async def test_category_writes_invalidate_cache(client, auth_headers, global_category):
+    before = (await client.get("/categories/", headers=auth_headers)).json()
+    assert [category["name"] for category in before] == ["Продукти", "Інше"]
+
+    created = await client.post("/categories/", headers=auth_headers, json={"name": "books"})
+    assert created.status_code == 201
+
+    after = (await client.get("/categories/", headers=auth_headers)).json()
+    assert [category["name"] for category in after] == ["Продукти", "Інше", "Books"]
+
+    deleted = await client.delete(f"/categories/{created.json()['id']}", headers=auth_headers)
+    assert deleted.status_code == 204
+
+    final = (await client.get("/categories/", headers=auth_headers)).json()
+    assert final == before
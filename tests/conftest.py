@@ -1,26 +1,110 @@
+import hashlib
+import os
+import time
+
 import pytest
 import pytest_asyncio
+from contextlib import contextmanager
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from src.main import app
 from src.database import get_session, Base
-from src.database import get_redis_client
+from src.redis_utils import get_redis_client
+from src.auth.models import User
+from src.categories.models import Category
+from src.auth.utils import create_access_token
+from src.auth import cache as auth_cache
+from src.categories import cache as category_cache
+from src.metrics import record_queries
+from src.rate_limit import SLIDING_WINDOW
+from src.auth.scripts import CONSUME_CODE, READ_REFRESH_TOKEN, RESEND_CODE
+from redis import asyncio as aioredis
+from redis.exceptions import NoScriptError
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 TestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def _sliding_window(redis, keys, args):
+    now = time.time() * 1000
+    member, limits = args[0], args[1:]
+    windows = [redis.store.setdefault(key, []) for key in keys]
+    retry_after = 0
+
+    for i, window in enumerate(windows):
+        length, limit = limits[i * 2], limits[i * 2 + 1]
+        window[:] = [stamp for stamp in window if stamp > now - length]
+        if len(window) >= limit:
+            retry_after = max(retry_after, window[0] + length - now, 1)
+
+    if retry_after:
+        return int(retry_after)
+    for window in windows:
+        window.append(now)
+    return 0
+
+
+def _resend_code(redis, keys, args):
+    # FakeRedis keeps no expiry times, so an existing block always reports the full wait.
+    if keys[0] in redis.store:
+        return args[2]
+    redis.store[keys[1]] = args[0]
+    redis.store[keys[0]] = "1"
+    return 0
+
+
+def _consume_code(redis, keys, args):
+    if redis.store.get(keys[0]) == args[0]:
+        del redis.store[keys[0]]
+        return 1
+    return 0
+
+
+def _read_refresh_token(redis, keys, args):
+    user_id = redis.store.get(keys[0])
+    if user_id is None:
+        return []
+    return [user_id, redis.store.get(args[0] + user_id)]
+
+
+# Python stand-ins for the Lua scripts the app runs, keyed by script SHA. The scripts themselves are
+# tested against `lua_redis`.
+LUA_SCRIPTS = {
+    SLIDING_WINDOW.sha: _sliding_window,
+    RESEND_CODE.sha: _resend_code,
+    CONSUME_CODE.sha: _consume_code,
+    READ_REFRESH_TOKEN.sha: _read_refresh_token,
+}
+
+
 class FakeRedis:
     def __init__(self):
         self.store = {}
+        self.loaded_scripts = set()
+
+    async def script_load(self, source):
+        sha = hashlib.sha1(source.encode()).hexdigest()
+        self.loaded_scripts.add(sha)
+        return sha
+
+    async def evalsha(self, sha, numkeys, *keys_and_args):
+        if sha not in self.loaded_scripts:
+            raise NoScriptError("No matching script")
+        return LUA_SCRIPTS[sha](self, list(keys_and_args[:numkeys]), list(keys_and_args[numkeys:]))
 
     async def get(self, key):
         return self.store.get(key)
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
         self.store[key] = value
+        return True
+
+    async def getdel(self, key):
+        return self.store.pop(key, None)
 
     async def setex(self, name, time, value):
         self.store[name] = value
@@ -30,6 +114,32 @@ class FakeRedis:
         if key in self.store:
             del self.store[key]
 
+    async def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+
+@pytest.fixture
+def db_engine():
+    return engine
+
+
+@pytest.fixture
+def assert_max_queries(db_engine):
+    @contextmanager
+    def checker(limit: int):
+        with record_queries(db_engine) as statements:
+            yield statements
+
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+
+    return checker
+
 
 @pytest_asyncio.fixture
 async def session():
@@ -44,18 +154,70 @@ async def session():
 
 
 @pytest_asyncio.fixture
-async def client(session):
+async def user(session):
+    user = User(email="user@example.com", password="hashed", is_verified=True)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+@pytest_asyncio.fixture
+async def global_category(session):
+    category = Category(name="Продукти", user_id=None)
+    session.add(category)
+    await session.commit()
+    await session.refresh(category)
+    return category
+
+
+@pytest.fixture
+def auth_headers(user):
+    access_token = create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest_asyncio.fixture
+async def lua_redis():
+    """
+    Redis that runs the Lua scripts as shipped: the server at `REDIS_TEST_URL` (flushed, so point it at
+    a spare database), otherwise fakeredis with Lua support. Skips the test when neither is available.
+    """
+    url = os.environ.get("REDIS_TEST_URL")
+    if url:
+        redis = aioredis.from_url(url, decode_responses=True)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    await redis.flushdb()
+    yield redis
+    await redis.flushdb()
+    await redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def client(session, fake_redis):
     async def override_get_session():
         yield session
 
-    fake_redis = FakeRedis()
-
     async def override_get_redis():
         yield fake_redis
 
     app.dependency_overrides[get_session] = override_get_session
     app.dependency_overrides[get_redis_client] = override_get_redis
 
+    auth_cache._token_cache.clear()
+    auth_cache._user_cache.clear()
+    category_cache._user_categories.clear()
+    category_cache._global_categories = None
+
     async with AsyncClient(transport=ASGITransport(app=app), base_url="https://test") as c:
         yield c
 
@@ -0,0 +1,140 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select, update
+
+from src.recurring.models import RecurringTransaction
+from src.recurring.utils import generate_due_transactions, occurrence_date
+from src.statistics.models import DailyRollup
+from src.transactions.models import Transaction
+
+TODAY = date(2026, 10, 18)
+
+
+def _rule(user_id: int, category_id: int, start_date: date, **fields) -> RecurringTransaction:
+    fields = {"type": "expense", "name": "Rent", "amount": 100.0, "frequency": "monthly", "interval": 1, **fields}
+    return RecurringTransaction(
+        user_id=user_id, category_id=category_id, start_date=start_date, next_date=start_date, occurrences=0, **fields,
+    )
+
+
+async def _dates(session, name: str) -> list[date]:
+    result = await session.execute(
+        select(Transaction.date).where(Transaction.name == name).order_by(Transaction.date)
+    )
+    return [value.date() for value in result.scalars()]
+
+
+def test_monthly_occurrences_keep_the_start_day():
+    assert [occurrence_date(date(2024, 1, 31), "monthly", 1, n) for n in range(4)] == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+    ]
+    assert occurrence_date(date(2024, 2, 29), "yearly", 1, 1) == date(2025, 2, 28)
+    assert occurrence_date(date(2026, 1, 1), "weekly", 2, 3) == date(2026, 2, 12)
+
+
+@pytest.mark.asyncio
+async def test_generates_due_occurrences_for_all_rules(session, user, global_category):
+    other = _rule(user.id, global_category.id, date(2026, 9, 1), name="Gym", frequency="weekly", interval=2, end_date=date(2026, 10, 1))
+    session.add_all([_rule(user.id, global_category.id, date(2026, 1, 31)), other])
+    await session.commit()
+
+    created = await generate_due_transactions(session, TODAY, max_occurrences=366)
+    await session.commit()
+
+    assert created == {user.id: 12}
+    assert await _dates(session, "Rent") == [occurrence_date(date(2026, 1, 31), "monthly", 1, n) for n in range(9)]
+    assert await _dates(session, "Gym") == [date(2026, 9, 1), date(2026, 9, 15), date(2026, 9, 29)]
+
+    rules = {rule.name: rule for rule in (await session.scalars(select(RecurringTransaction))).all()}
+    await session.refresh(rules["Rent"])
+    await session.refresh(rules["Gym"])
+    assert (rules["Rent"].occurrences, rules["Rent"].next_date) == (9, date(2026, 10, 31))
+    assert (rules["Gym"].occurrences, rules["Gym"].next_date) == (3, None)
+
+    assert await session.scalar(select(func.sum(DailyRollup.total))) == 9 * 100 + 3 * 100
+
+
+@pytest.mark.asyncio
+async def test_generation_is_idempotent(session, user, global_category):
+    rule = _rule(user.id, global_category.id, date(2026, 8, 1))
+    session.add(rule)
+    await session.commit()
+
+    assert await generate_due_transactions(session, TODAY, max_occurrences=366) == {user.id: 3}
+    await session.commit()
+    assert await generate_due_transactions(session, TODAY, max_occurrences=366) == {}
+
+    # Even with the progress lost, e.g. after a crash between runs, the unique index stops duplicates.
+    await session.execute(update(RecurringTransaction).values(occurrences=0, next_date=rule.start_date))
+    assert await generate_due_transactions(session, TODAY, max_occurrences=366) == {}
+    await session.commit()
+
+    assert len(await _dates(session, "Rent")) == 3
+    assert await session.scalar(select(func.sum(DailyRollup.count))) == 3
+
+
+@pytest.mark.asyncio
+async def test_backlog_is_caught_up_over_several_runs(session, user, global_category):
+    session.add(_rule(user.id, global_category.id, date(2026, 10, 1), frequency="daily"))
+    await session.commit()
+
+    assert await generate_due_transactions(session, TODAY, max_occurrences=10) == {user.id: 10}
+    assert await generate_due_transactions(session, TODAY, max_occurrences=10) == {user.id: 8}
+    await session.commit()
+
+    assert await _dates(session, "Rent") == [date(2026, 10, day) for day in range(1, 19)]
+
+
+@pytest.mark.asyncio
+async def test_recurring_endpoints(client, auth_headers, global_category):
+    created = await client.post("/recurring/", headers=auth_headers, json={
+        "name": "Rent", "amount": "9000.00", "category_id": global_category.id, "start_date": "2026-01-15",
+    })
+    assert created.status_code == 201
+    rule = created.json()
+    assert (rule["frequency"], rule["interval"], rule["next_date"]) == ("monthly", 1, "2026-01-15")
+    assert rule["category"]["id"] == global_category.id
+
+    updated = await client.patch(f"/recurring/{rule['id']}", headers=auth_headers, json={"end_date": "2026-01-10"})
+    assert updated.status_code == 422
+
+    updated = await client.patch(f"/recurring/{rule['id']}", headers=auth_headers, json={"amount": "9500.00", "end_date": "2026-01-31"})
+    assert updated.status_code == 200
+    assert updated.json()["amount"] == "9500.00"
+
+    listed = await client.get("/recurring/", headers=auth_headers)
+    assert [item["id"] for item in listed.json()] == [rule["id"]]
+
+    deleted = await client.delete(f"/recurring/{rule['id']}", headers=auth_headers)
+    assert deleted.status_code == 204
+    assert (await client.get("/recurring/", headers=auth_headers)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_cannot_edit_other_users_rules(client, session, auth_headers, global_category):
+    rule = _rule(user_id=999, category_id=global_category.id, start_date=TODAY)
+    session.add(rule)
+    await session.commit()
+
+    response = await client.patch(f"/recurring/{rule.id}", headers=auth_headers, json={"name": "Mine"})
+    assert response.status_code == 403
+
+    response = await client.delete("/recurring/12345", headers=auth_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_rejects_null_for_required_fields(client, session, user, auth_headers, global_category):
+    rule = _rule(user.id, global_category.id, TODAY, end_date=date(2026, 12, 31))
+    session.add(rule)
+    await session.commit()
+    rule_id = rule.id
+
+    for field in ("type", "name", "amount"):
+        response = await client.patch(f"/recurring/{rule_id}", headers=auth_headers, json={field: None})
+        assert response.status_code == 422
+
+    response = await client.patch(f"/recurring/{rule_id}", headers=auth_headers, json={"end_date": None, "category_id": None})
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["end_date"], response.json()["category"]) == ("Rent", None, None)
@@ -0,0 +1,22 @@
+import pytest
+from datetime import date
+
+from src.statistics.cache import bump_stats_version
+from src.statistics.models import DailyRollup
+
+
+@pytest.mark.asyncio
+async def test_dashboard_is_cached_until_version_bump(client, session, fake_redis, user, auth_headers):
+    first = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert first["current_balance"] == 0
+
+    session.add(DailyRollup(user_id=user.id, day=date.today(), type="income", category_id=None, total=50, count=1))
+    await session.commit()
+
+    cached = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert cached == first
+
+    await bump_stats_version(user.id, fake_redis)
+
+    fresh = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert fresh["current_balance"] == 50
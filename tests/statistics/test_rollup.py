@@ -0,0 +1,99 @@
+import pytest
+from datetime import date
+
+from src.categories.models import Category
+
+
+@pytest.fixture
+async def categories(session):
+    food = Category(name="Продукти", user_id=None)
+    salary = Category(name="Зарплата", user_id=None)
+    session.add_all([food, salary])
+    await session.commit()
+    return food, salary
+
+
+@pytest.mark.asyncio
+async def test_statistics_follow_transaction_writes(client, auth_headers, categories):
+    food, salary = categories
+    today = date.today().isoformat()
+
+    await client.post("/transactions/", headers=auth_headers, json={
+        "type": "income", "name": "Salary", "amount": "1000", "category_id": salary.id, "date": f"{today}T10:00:00Z",
+    })
+    response = await client.post("/transactions/", headers=auth_headers, json={
+        "type": "expense", "name": "Milk", "amount": "40", "category_id": food.id, "date": f"{today}T12:00:00Z",
+    })
+    milk_id = response.json()["id"]
+
+    dashboard = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert dashboard["current_balance"] == 960
+    assert dashboard["last_month_expenses"] == 40
+
+    await client.patch(f"/transactions/{milk_id}", headers=auth_headers, json={"type": "expense", "amount": "100"})
+
+    dashboard = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert dashboard["current_balance"] == 900
+
+    categories_stats = (await client.get("/statistics/categories", headers=auth_headers)).json()
+    assert [(stat["category"]["id"], stat["total_amount"]) for stat in categories_stats] == [(food.id, 100)]
+
+    history = (await client.get("/statistics/history", headers=auth_headers)).json()
+    assert history[-1] == {"date": today, "income": 1000, "expense": 100}
+
+    await client.delete(f"/transactions/{milk_id}", headers=auth_headers)
+
+    dashboard = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert dashboard["current_balance"] == 1000
+    assert dashboard["last_month_expenses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_history_granularity(client, auth_headers, categories):
+    food, salary = categories
+
+    for day, amount in [("2025-01-06", "10"), ("2025-01-12", "20"), ("2025-01-13", "30"), ("2025-02-01", "40")]:
+        await client.post("/transactions/", headers=auth_headers, json={
+            "type": "expense", "name": "Food", "amount": amount, "category_id": food.id, "date": f"{day}T12:00:00Z",
+        })
+
+    params = {"start_date": "2025-01-01", "end_date": "2025-02-28"}
+
+    weekly = (await client.get("/statistics/history", params={**params, "granularity": "week"}, headers=auth_headers)).json()
+    assert weekly[0] == {"date": "2024-12-30", "income": 0, "expense": 0}
+    assert weekly[1] == {"date": "2025-01-06", "income": 0, "expense": 30}
+    assert weekly[2] == {"date": "2025-01-13", "income": 0, "expense": 30}
+    assert weekly[-1]["date"] == "2025-02-24"
+
+    monthly = (await client.get("/statistics/history", params={**params, "granularity": "month"}, headers=auth_headers)).json()
+    assert monthly == [
+        {"date": "2025-01-01", "income": 0, "expense": 60},
+        {"date": "2025-02-01", "income": 0, "expense": 40},
+    ]
+
+    daily = (await client.get("/statistics/history", params=params, headers=auth_headers)).json()
+    assert len(daily) == 59
+    assert daily[5] == {"date": "2025-01-06", "income": 0, "expense": 10}
+
+
+@pytest.mark.asyncio
+async def test_history_unknown_time_zone(client, auth_headers):
+    response = await client.get("/statistics/history", params={"tz": "Mars/Olympus"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_history_in_time_zone(client, auth_headers, categories):
+    food, salary = categories
+
+    await client.post("/transactions/", headers=auth_headers, json={
+        "type": "expense", "name": "Late dinner", "amount": "25", "category_id": food.id, "date": "2025-01-06T23:30:00Z",
+    })
+
+    params = {"start_date": "2025-01-06", "end_date": "2025-01-07", "tz": "Asia/Tokyo"}
+    history = (await client.get("/statistics/history", params=params, headers=auth_headers)).json()
+
+    assert history == [
+        {"date": "2025-01-06", "income": 0, "expense": 0},
+        {"date": "2025-01-07", "income": 0, "expense": 25},
+    ]
@@ -0,0 +1,23 @@
+import sqlite3
+
+from prometheus_client import REGISTRY
+
+from src.database import InstrumentedPool, pool_stats
+
+
+def test_instrumented_pool_records_checkouts_and_overflow():
+    pool = InstrumentedPool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1)
+    checkouts, overflow_events = pool_stats.checkouts, pool_stats.overflow_events
+    overflow_total = REGISTRY.get_sample_value("db_pool_overflow_events_total") or 0
+    waits = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+
+    first = pool.connect()
+    second = pool.connect()
+
+    assert pool_stats.checkouts == checkouts + 2
+    assert pool_stats.overflow_events == overflow_events + 1
+    assert REGISTRY.get_sample_value("db_pool_overflow_events_total") == overflow_total + 1
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") == waits + 2
+
+    first.close()
+    second.close()
@@ -0,0 +1,58 @@
+import pytest
+
+from src.auth import cache as auth_cache
+from src.categories.models import Category
+
+NEW_TRANSACTION = {"type": "expense", "name": "Milk", "amount": "40", "date": "2025-01-01T10:00:00Z"}
+
+
+@pytest.fixture
+async def category(session, user):
+    category = Category(name="Кава", user_id=user.id)
+    session.add(category)
+    await session.commit()
+    return category
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/categories/", "/transactions/", "/transactions/cursor", "/statistics/dashboard"])
+async def test_matching_etag_returns_304_without_db(client, auth_headers, assert_max_queries, category, path):
+    first = await client.get(path, headers=auth_headers)
+    etag = first.headers["ETag"]
+
+    auth_cache._user_cache.clear()
+    with assert_max_queries(0):
+        response = await client.get(path, headers={**auth_headers, "If-None-Match": f'W/{etag}, "other"'})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_transaction_write_changes_etag(client, auth_headers, category):
+    before = (await client.get("/statistics/dashboard", headers=auth_headers)).headers["ETag"]
+
+    await client.post("/transactions/", headers=auth_headers, json={**NEW_TRANSACTION, "category_id": category.id})
+
+    response = await client.get("/statistics/dashboard", headers={**auth_headers, "If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != before
+
+
+@pytest.mark.asyncio
+async def test_category_write_changes_transactions_etag(client, auth_headers, category):
+    before = (await client.get("/transactions/cursor", headers=auth_headers)).headers["ETag"]
+
+    await client.patch(f"/categories/{category.id}", headers=auth_headers, json={"name": "Чай"})
+
+    response = await client.get("/transactions/cursor", headers={**auth_headers, "If-None-Match": before})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_etag_depends_on_query(client, auth_headers, category):
+    first = await client.get("/transactions/cursor", params={"size": 10}, headers=auth_headers)
+    second = await client.get("/transactions/cursor", params={"size": 20}, headers=auth_headers)
+
+    assert first.headers["ETag"] != second.headers["ETag"]
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import event
+
+from src import metrics
+
+
+@pytest.fixture
+def instrumented_engine(db_engine):
+    engine = db_engine
+    event.listen(engine.sync_engine, "before_cursor_execute", metrics._before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", metrics._after_cursor_execute)
+    yield engine
+    event.remove(engine.sync_engine, "before_cursor_execute", metrics._before_cursor_execute)
+    event.remove(engine.sync_engine, "after_cursor_execute", metrics._after_cursor_execute)
+
+
+@pytest.fixture
+def metrics_headers(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "scrape-secret")
+    return {"Authorization": "Bearer scrape-secret"}
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_and_sql_stats(client, auth_headers, instrumented_engine, metrics_headers):
+    response = await client.get("/transactions/cursor", params={"include_total": True}, headers=auth_headers)
+    assert response.status_code == 200
+
+    response = await client.get("/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/transactions/cursor",status="200"}' in body
+
+    sums = [line for line in body.splitlines() if line.startswith('db_queries_per_request_sum{route="/transactions/cursor"}')]
+    assert sums and float(sums[0].split()[-1]) >= 2
+
+
+@pytest.mark.asyncio
+async def test_monitoring_endpoints_require_the_token(client, monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "")
+    assert (await client.get("/metrics")).status_code == 404
+    assert (await client.get("/health/db-pool")).status_code == 404
+
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "scrape-secret")
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/health/db-pool", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    assert (await client.get("/health/db-pool", headers={"Authorization": "Bearer scrape-secret"})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_with_plan(client, auth_headers, instrumented_engine, monkeypatch, caplog):
+    monkeypatch.setattr(metrics.settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    monkeypatch.setattr(metrics.settings, "SQL_EXPLAIN_SLOW_QUERIES", True)
+
+    with caplog.at_level("WARNING", logger="uvicorn"):
+        await client.get("/transactions/cursor", headers=auth_headers)
+
+    slow = [record.message for record in caplog.records if record.message.startswith("Slow query")]
+    assert any("FROM transactions" in message and "Plan:" in message for message in slow)
+
+
+def test_repeated_statements_are_reported():
+    stats = metrics.RequestStats()
+    stats.statements["SELECT 1"] += 6
+    stats.statements["SELECT 2"] += 1
+
+    assert stats.repeated_statements(5) == [("SELECT 1", 6)]
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.auth.models import User
+from src.outbox import relay as outbox_relay
+from src.outbox.models import OutboxMessage
+from src.outbox.relay import OutboxRelay, add_message
+
+
+@pytest.fixture
+def published(monkeypatch):
+    messages = []
+
+    async def publish(message, queue):
+        if message.get("fail"):
+            raise ConnectionError("broker is down")
+        messages.append((queue, message))
+
+    monkeypatch.setattr(outbox_relay, "publish", publish)
+    return messages
+
+
+@pytest.fixture
+def relay(db_engine):
+    return OutboxRelay(async_sessionmaker(db_engine, expire_on_commit=False), batch_size=2, poll_interval=0.01)
+
+
+async def _outbox(session) -> list[dict]:
+    session.expire_all()
+    return list((await session.scalars(select(OutboxMessage.payload).order_by(OutboxMessage.id))).all())
+
+
+@pytest.mark.asyncio
+async def test_register_writes_the_email_to_the_outbox(client, session, fake_redis, published):
+    response = await client.post("/auth/register", json={"email": "new@example.com", "password": "password123"})
+
+    assert response.status_code == 201
+    assert published == []
+    assert await _outbox(session) == [
+        {"email": "new@example.com", "code": fake_redis.store["verification:new@example.com"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_forgot_password_writes_the_email_to_the_outbox(client, session, fake_redis, user, published):
+    email = user.email
+    response = await client.post("/auth/forgot", json={"email": email})
+
+    assert response.status_code == 202
+    assert published == []
+    [message] = await _outbox(session)
+    assert message["email"] == email
+    assert fake_redis.store[f"pwd_reset:{message['token']}"] == email
+
+
+@pytest.mark.asyncio
+async def test_outbox_message_is_discarded_with_its_transaction(session):
+    session.add(User(email="rolled-back@example.com", password="hashed"))
+    add_message(session, {"email": "rolled-back@example.com"}, queue="verification")
+    await session.rollback()
+
+    assert await _outbox(session) == []
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_batches_and_keeps_failures(session, relay, published):
+    for message in ({"n": 1}, {"n": 2, "fail": True}, {"n": 3}):
+        add_message(session, message, queue="verification")
+    await session.commit()
+
+    assert await relay.relay_batch() == 1
+    assert await relay.relay_batch() == 1
+    assert published == [("verification", {"n": 1}), ("verification", {"n": 3})]
+    assert await _outbox(session) == [{"n": 2, "fail": True}]
+
+
+@pytest.mark.asyncio
+async def test_relay_task_publishes_when_woken(session, relay, published):
+    relay.poll_interval = 60
+    relay.start()
+    try:
+        await asyncio.sleep(0.01)
+        add_message(session, {"n": 1}, queue="verification")
+        await session.commit()
+        relay.wake()
+
+        for _ in range(100):
+            if published:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await relay.stop()
+
+    assert published == [("verification", {"n": 1})]
@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime, timezone
+
+from src.transactions.models import Transaction
+
+NEW_TRANSACTION = {"type": "expense", "name": "Milk", "amount": "40", "date": "2025-01-01T10:00:00Z"}
+
+
+@pytest.fixture
+async def transaction(session, user, global_category):
+    transaction = Transaction(
+        user_id=user.id, category_id=global_category.id, type="expense", name="Bread", amount=20,
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    session.add(transaction)
+    await session.commit()
+    return transaction
+
+
+@pytest.fixture
+async def warm_client(client, auth_headers, global_category):
+    # The first request fills the user and category caches.
+    await client.get("/categories/", headers=auth_headers)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_read_routes_query_budget(warm_client, auth_headers, assert_max_queries, transaction):
+    with assert_max_queries(0):
+        await warm_client.get("/categories/", headers=auth_headers)
+
+    with assert_max_queries(1):
+        await warm_client.get("/transactions/cursor", headers=auth_headers)
+
+    with assert_max_queries(1):
+        await warm_client.get(f"/transactions/{transaction.id}", headers=auth_headers)
+
+    with assert_max_queries(1):
+        await warm_client.get("/statistics/dashboard", headers=auth_headers)
+
+    with assert_max_queries(0):
+        await warm_client.get("/statistics/dashboard", headers=auth_headers)
+
+    with assert_max_queries(1):
+        await warm_client.get("/statistics/history", headers=auth_headers)
+
+
+@pytest.mark.asyncio
+async def test_write_routes_query_budget(warm_client, auth_headers, assert_max_queries, global_category, transaction):
+    with assert_max_queries(2):
+        response = await warm_client.post("/transactions/", headers=auth_headers, json={**NEW_TRANSACTION, "category_id": global_category.id})
+    assert response.status_code == 200
+
+    # SQLite selects the old row separately, Postgres does it in the UPDATE itself.
+    with assert_max_queries(4):
+        response = await warm_client.patch(f"/transactions/{transaction.id}", headers=auth_headers, json={"type": "income"})
+    assert response.status_code == 200
+
+    with assert_max_queries(2):
+        response = await warm_client.delete(f"/transactions/{transaction.id}", headers=auth_headers)
+    assert response.status_code == 204
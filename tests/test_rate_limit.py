@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.auth import routes as auth_routes
+from src.rate_limit import SLIDING_WINDOW, Limit, parse_limit, rate_limit
+from src.redis_utils import get_redis_client
+
+
+@pytest.fixture
+def fake_redis(lua_redis):
+    # Runs the sliding window script itself instead of the conftest stand-in.
+    return lua_redis
+
+
+@pytest.fixture
+async def limited_client(fake_redis):
+    app = FastAPI()
+
+    @app.post("/limited", dependencies=[Depends(rate_limit("test", ip="3/minute", email="2/minute"))])
+    async def limited():
+        return {"ok": True}
+
+    async def override_get_redis():
+        return fake_redis
+
+    app.dependency_overrides[get_redis_client] = override_get_redis
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://test") as client:
+        yield client
+
+
+def test_parse_limit():
+    assert parse_limit("5/minute") == Limit(5, 60)
+    assert parse_limit("10/30") == Limit(10, 30)
+    assert parse_limit("") is None
+    with pytest.raises(ValueError):
+        parse_limit("5 per minute")
+
+
+@pytest.mark.asyncio
+async def test_email_limit_is_separate_from_ip_limit(limited_client):
+    statuses = [
+        (await limited_client.post("/limited", json={"email": email})).status_code
+        for email in ["a@example.com", "A@example.com ", "a@example.com", "b@example.com"]
+    ]
+
+    assert statuses == [200, 200, 429, 200]
+
+
+@pytest.mark.asyncio
+async def test_ip_limit_and_retry_after(limited_client):
+    statuses = [(await limited_client.post("/limited")).status_code for _ in range(3)]
+    rejected = await limited_client.post("/limited")
+
+    assert statuses == [200, 200, 200]
+    assert rejected.status_code == 429
+    assert 0 < int(rejected.headers["Retry-After"]) <= 60
+
+
+@pytest.mark.asyncio
+async def test_window_slides_and_expires(lua_redis):
+    async def hit(member):
+        return await SLIDING_WINDOW(lua_redis, ["rate:test:ip:1"], [member, 300, 2])
+
+    assert await hit("a") == 0
+    await asyncio.sleep(0.2)
+    assert await hit("b") == 0
+    assert 0 < await hit("rejected") <= 100
+    assert 0 < await lua_redis.pttl("rate:test:ip:1") <= 300
+
+    await asyncio.sleep(0.2)
+    # "a" has slid out of the window, "b" is still in it.
+    assert await hit("c") == 0
+    assert await lua_redis.zrange("rate:test:ip:1", 0, -1) == ["b", "c"]
+
+    await asyncio.sleep(0.35)
+    assert await lua_redis.exists("rate:test:ip:1") == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_request_uses_up_no_limit(lua_redis):
+    keys = ["rate:test:ip:1", "rate:test:email:a@example.com"]
+
+    assert await SLIDING_WINDOW(lua_redis, keys, ["a", 60_000, 1, 60_000, 5]) == 0
+    assert await SLIDING_WINDOW(lua_redis, keys, ["b", 60_000, 1, 60_000, 5]) > 0
+    assert await lua_redis.zcard(keys[1]) == 1
+
+
+@pytest.mark.asyncio
+async def test_login_is_rejected_before_db_and_hashing(client, user, assert_max_queries, monkeypatch):
+    hashed = []
+
+    async def verify(password, hash):
+        hashed.append(password)
+        return False, None
+
+    monkeypatch.setattr(auth_routes, "verify_and_update_password", verify)
+    credentials = {"email": user.email, "password": "guess"}
+
+    for _ in range(5):
+        assert (await client.post("/auth/login", json=credentials)).status_code == 401
+
+    with assert_max_queries(0):
+        response = await client.post("/auth/login", json=credentials)
+
+    assert response.status_code == 429
+    assert len(hashed) == 5
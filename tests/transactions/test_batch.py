@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_batch_create(client, auth_headers, global_category):
+    items = [
+        {"type": "expense", "name": f"Item {i}", "amount": str(10 * i), "category_id": global_category.id, "date": f"2025-01-0{i}T10:00:00Z"}
+        for i in range(1, 4)
+    ]
+
+    response = await client.post("/transactions/batch", headers=auth_headers, json={"items": items})
+
+    assert response.status_code == 200
+    created = response.json()
+    assert [item["name"] for item in created] == ["Item 1", "Item 2", "Item 3"]
+    assert all(item["category"]["id"] == global_category.id for item in created)
+
+    fetched = await client.get(f"/transactions/{created[1]['id']}", headers=auth_headers)
+    assert fetched.json()["name"] == "Item 2"
+
+
+@pytest.mark.asyncio
+async def test_batch_create_is_atomic(client, auth_headers, global_category):
+    items = [
+        {"type": "expense", "name": "Valid", "amount": "10", "category_id": global_category.id, "date": "2025-01-01T10:00:00Z"},
+        {"type": "expense", "name": "Invalid", "amount": "10", "category_id": 999, "date": "2025-01-01T10:00:00Z"},
+    ]
+
+    response = await client.post("/transactions/batch", headers=auth_headers, json={"items": items})
+    assert response.status_code == 404
+
+    listed = await client.get("/transactions/cursor", params={"include_total": True}, headers=auth_headers)
+    assert listed.json()["total"] == 0
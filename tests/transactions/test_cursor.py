@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from src.transactions.models import Transaction
+from src.transactions.schemas import TransactionOut
+
+
+@pytest.fixture
+async def transactions(session, user, global_category):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Transaction(
+            user_id=user.id,
+            category_id=global_category.id,
+            type="expense" if i % 2 else "income",
+            name=f"Transaction {i}",
+            amount=10 + i,
+            date=start + timedelta(days=i // 2),
+        )
+        for i in range(7)
+    ]
+    session.add_all(items)
+    await session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_all_rows(client, auth_headers, transactions):
+    seen = []
+    cursor = None
+
+    while True:
+        params = {"size": 3}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = await client.get("/transactions/cursor", params=params, headers=auth_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    expected = sorted(transactions, key=lambda t: (t.date, t.id), reverse=True)
+    assert seen == [t.id for t in expected]
+
+
+@pytest.mark.asyncio
+async def test_cursor_total_is_optional(client, auth_headers, transactions):
+    response = await client.get("/transactions/cursor", headers=auth_headers)
+    assert response.json()["total"] is None
+
+    response = await client.get(
+        "/transactions/cursor",
+        params={"include_total": True, "transaction_type": "income"},
+        headers=auth_headers
+    )
+    assert response.json()["total"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cursor_invalid(client, auth_headers):
+    response = await client.get("/transactions/cursor", params={"cursor": "garbage"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_offset_pages_share_cursor_order(client, auth_headers, transactions):
+    response = await client.get("/transactions/", params={"page": 1, "size": 3}, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 7
+    assert [item["id"] for item in body["items"]] == [
+        item.id for item in sorted(transactions, key=lambda t: (t.date, t.id), reverse=True)[:3]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_json_matches_response_model(client, auth_headers, session, user, transactions):
+    uncategorized = Transaction(
+        user_id=user.id, category_id=None, type="expense", name="Cash", amount=12.5,
+        date=datetime(2026, 1, 1, 9, 30, tzinfo=timezone.utc),
+    )
+    session.add(uncategorized)
+    await session.commit()
+    session.expire_all()
+
+    result = await session.execute(
+        select(Transaction)
+        .options(joinedload(Transaction.category))
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+    )
+    expected = [TransactionOut.model_validate(item).model_dump(mode="json") for item in result.scalars()]
+
+    cursor_page = (await client.get("/transactions/cursor", headers=auth_headers)).json()
+    offset_page = (await client.get("/transactions/", headers=auth_headers)).json()
+
+    assert cursor_page["items"] == expected
+    assert offset_page["items"] == expected
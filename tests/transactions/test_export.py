@@ -0,0 +1,40 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.transactions.models import Transaction
+
+
+@pytest.fixture
+async def transactions(session, user, global_category):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Transaction(user_id=user.id, category_id=global_category.id, type="expense", name=f"Item {i}", amount=i, date=start + timedelta(days=i))
+        for i in range(5)
+    ]
+    session.add_all(items)
+    await session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_export_csv(client, auth_headers, transactions):
+    response = await client.get("/transactions/export", headers=auth_headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == [f"Item {i}" for i in reversed(range(5))]
+    assert rows[0]["category"] == "Продукти"
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_gzip(client, auth_headers, transactions):
+    response = await client.get("/transactions/export", params={"format": "ndjson", "gzip": True}, headers=auth_headers)
+
+    assert response.status_code == 200
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert len(lines) == 5
+    assert json.loads(lines[-1])["name"] == "Item 0"
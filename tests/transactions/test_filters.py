@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.categories.models import Category
+from src.transactions.models import Transaction
+
+
+@pytest.fixture
+async def transactions(session, user):
+    food = Category(name="Продукти", user_id=None)
+    transport = Category(name="Транспорт", user_id=None)
+    rent = Category(name="Житло", user_id=None)
+    session.add_all([food, transport, rent])
+    await session.flush()
+
+    start = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    categories = [food, transport, rent]
+    items = [
+        Transaction(
+            user_id=user.id,
+            category_id=categories[i % 3].id,
+            type="income" if i % 4 == 0 else "expense",
+            name=f"Transaction {i}",
+            amount=10 * (i + 1),
+            date=start + timedelta(days=i),
+        )
+        for i in range(12)
+    ]
+    session.add_all(items)
+    await session.commit()
+    return items
+
+
+async def fetch(client, auth_headers, path, params):
+    response = await client.get(path, params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return sorted(item["name"] for item in response.json()["items"])
+
+
+def expected(transactions, predicate):
+    return sorted(t.name for t in transactions if predicate(t))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/transactions/", "/transactions/cursor"])
+async def test_date_range_includes_both_days(client, auth_headers, transactions, path):
+    names = await fetch(client, auth_headers, path, {"start_date": "2025-01-03", "end_date": "2025-01-05"})
+
+    assert names == expected(transactions, lambda t: 2 <= (t.date - transactions[0].date).days <= 4)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/transactions/", "/transactions/cursor"])
+async def test_several_categories(client, auth_headers, transactions, path):
+    wanted = {transactions[0].category_id, transactions[2].category_id}
+    params = [("category_id", category_id) for category_id in wanted]
+
+    names = await fetch(client, auth_headers, path, params)
+
+    assert names == expected(transactions, lambda t: t.category_id in wanted)
+
+
+@pytest.mark.asyncio
+async def test_amount_range_and_type_combine(client, auth_headers, transactions):
+    params = {"min_amount": 30, "max_amount": 90, "transaction_type": "expense"}
+
+    names = await fetch(client, auth_headers, "/transactions/cursor", params)
+
+    assert names == expected(transactions, lambda t: 30 <= t.amount <= 90 and t.type == "expense")
+
+
+@pytest.mark.asyncio
+async def test_negative_amount_is_rejected(client, auth_headers, transactions):
+    response = await client.get("/transactions/", params={"min_amount": -1}, headers=auth_headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,75 @@
+import json
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client, auth_headers, global_category):
+    content = (
+        "type,name,amount,category_id,date\n"
+        f"expense,Milk,40,{global_category.id},2025-01-01T10:00:00Z\n"
+        f"income,Salary,1000,{global_category.id},2025-01-02T10:00:00Z\n"
+        f"expense,Bad amount,abc,{global_category.id},2025-01-03T10:00:00Z\n"
+        "expense,Foreign,10,999,2025-01-03T10:00:00Z\n"
+    )
+
+    response = await client.post(
+        "/transactions/import",
+        headers=auth_headers,
+        files={"file": ("bank.csv", content.encode(), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["failed"] == 2
+    assert [error["row"] for error in data["errors"]] == [4, 5]
+
+    listed = await client.get("/transactions/cursor", params={"include_total": True}, headers=auth_headers)
+    assert listed.json()["total"] == 2
+
+    dashboard = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert dashboard["current_balance"] == 960
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson(client, auth_headers, global_category):
+    lines = [
+        json.dumps({"type": "expense", "name": "Bread", "amount": "20", "category_id": global_category.id, "date": "2025-01-01T10:00:00Z"}),
+        "{not json",
+    ]
+
+    response = await client.post(
+        "/transactions/import",
+        params={"format": "ndjson"},
+        headers=auth_headers,
+        files={"file": ("bank.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+
+    data = response.json()
+    assert data["imported"] == 1
+    assert data["errors"][0]["row"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_reports_undecodable_rows_after_the_first_batch(client, auth_headers, global_category):
+    good = [f"expense,Item {i},1,{global_category.id},2025-01-01T10:00:00Z\n" for i in range(1500)]
+    content = (
+        "type,name,amount,category_id,date\n"
+        + "".join(good)
+        + f"expense,{'Кава'.encode('cp1251').decode('latin-1')},5,{global_category.id},2025-01-02T10:00:00Z\n"
+        + f"expense,After,2,{global_category.id},2025-01-03T10:00:00Z\n"
+    )
+
+    response = await client.post(
+        "/transactions/import",
+        headers=auth_headers,
+        files={"file": ("bank.csv", content.encode("latin-1"), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 1501
+    assert data["errors"] == [{"row": 1502, "error": "Row is not valid UTF-8"}]
+
+    dashboard = (await client.get("/statistics/dashboard", headers=auth_headers)).json()
+    assert dashboard["current_balance"] == -1502
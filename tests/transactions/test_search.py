@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.transactions.models import Transaction
+
+
+@pytest.fixture
+async def transactions(session, user, global_category):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    names = ["Coffee", "Coffee beans", "Iced coffee", "Tea", "Coffee", "Coffee shop", "100% juice", "Rent"]
+    items = [
+        Transaction(
+            user_id=user.id,
+            category_id=global_category.id,
+            type="expense",
+            name=name,
+            amount=10,
+            date=start + timedelta(days=i),
+        )
+        for i, name in enumerate(names)
+    ]
+    session.add_all(items)
+    await session.commit()
+    return items
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_exact_then_prefix_then_substring(client, auth_headers, transactions):
+    response = await client.get("/transactions/cursor", params={"q": "coffee"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    names = [item["name"] for item in response.json()["items"]]
+    assert names == ["Coffee", "Coffee", "Coffee shop", "Coffee beans", "Iced coffee"]
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_pages_cover_all_matches(client, auth_headers, transactions):
+    seen = []
+    cursor = None
+
+    while True:
+        params = {"q": "coffee", "size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = (await client.get("/transactions/cursor", params=params, headers=auth_headers)).json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_search_escapes_like_wildcards(client, auth_headers, transactions):
+    response = await client.get("/transactions/", params={"q": "%"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()["items"]] == ["100% juice"]
+
+
+@pytest.mark.asyncio
+async def test_plain_cursor_is_rejected_for_search(client, auth_headers, transactions):
+    first = (await client.get("/transactions/cursor", params={"size": 2}, headers=auth_headers)).json()
+
+    response = await client.get(
+        "/transactions/cursor", params={"q": "coffee", "cursor": first["next_cursor"]}, headers=auth_headers
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,117 @@
+import pytest
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.auth.models import User
+from src.categories.models import Category
+from src.transactions.models import Transaction
+
+
+@pytest.fixture
+async def foreign_transaction(session, global_category):
+    other = User(email="other@example.com", password="hashed", is_verified=True)
+    session.add(other)
+    await session.flush()
+
+    transaction = Transaction(
+        user_id=other.id, category_id=global_category.id, type="expense", name="Foreign", amount=10,
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    session.add(transaction)
+    await session.commit()
+    return transaction
+
+
+@pytest.fixture
+async def foreign_keys(session):
+    # SQLite ignores foreign keys unless asked to, Postgres always checks them.
+    await session.commit()
+    await session.execute(text("PRAGMA foreign_keys=ON"))
+    yield
+    await session.rollback()
+    await session.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+@pytest.mark.asyncio
+async def test_patch_and_delete_other_users_transaction(client, auth_headers, foreign_transaction):
+    response = await client.patch(f"/transactions/{foreign_transaction.id}", headers=auth_headers, json={"type": "income"})
+    assert response.status_code == 403
+
+    response = await client.delete(f"/transactions/{foreign_transaction.id}", headers=auth_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_patch_and_delete_missing_transaction(client, auth_headers):
+    response = await client.patch("/transactions/999", headers=auth_headers, json={"type": "income"})
+    assert response.status_code == 404
+
+    response = await client.delete("/transactions/999", headers=auth_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_returns_updated_row(client, auth_headers, session, user, foreign_transaction):
+    own = Transaction(
+        user_id=user.id, category_id=foreign_transaction.category_id, type="expense", name="Milk", amount=10,
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    session.add(own)
+    await session.commit()
+
+    response = await client.patch(f"/transactions/{own.id}", headers=auth_headers, json={"type": "expense", "name": "Oat milk"})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Oat milk"
+    assert response.json()["category"]["name"] == "Продукти"
+
+
+@pytest.mark.asyncio
+async def test_patch_checks_the_transaction_before_the_category(client, auth_headers, session, user, foreign_transaction):
+    other_category = Category(name="Чуже", user_id=foreign_transaction.user_id)
+    own = Transaction(
+        user_id=user.id, category_id=foreign_transaction.category_id, type="expense", name="Milk", amount=10,
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    session.add_all([other_category, own])
+    await session.commit()
+    own_id, foreign_id, category_id = own.id, foreign_transaction.id, foreign_transaction.category_id
+    payload = {"type": "expense", "category_id": other_category.id}
+
+    response = await client.patch("/transactions/999", headers=auth_headers, json=payload)
+    assert response.status_code == 404
+
+    response = await client.patch(f"/transactions/{foreign_id}", headers=auth_headers, json=payload)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "You cannot edit other users' transactions"
+
+    response = await client.patch(f"/transactions/{own_id}", headers=auth_headers, json=payload)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "You cannot assign a category that belongs to another user"
+
+    fetched = await client.get(f"/transactions/{own_id}", headers=auth_headers)
+    assert fetched.json()["category"]["id"] == category_id
+
+
+@pytest.mark.asyncio
+async def test_patch_with_missing_category_is_not_found(client, auth_headers, session, user, foreign_transaction, foreign_keys):
+    own = Transaction(
+        user_id=user.id, category_id=foreign_transaction.category_id, type="expense", name="Milk", amount=10,
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    session.add(own)
+    await session.commit()
+    own_id, foreign_id, category_id = own.id, foreign_transaction.id, foreign_transaction.category_id
+    payload = {"type": "expense", "category_id": 999}
+
+    response = await client.patch(f"/transactions/{own_id}", headers=auth_headers, json=payload)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "New category not found"
+
+    response = await client.patch(f"/transactions/{foreign_id}", headers=auth_headers, json=payload)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "You cannot edit other users' transactions"
+
+    fetched = await client.get(f"/transactions/{own_id}", headers=auth_headers)
+    assert fetched.json()["category"]["id"] == category_id
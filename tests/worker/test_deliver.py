@@ -0,0 +1,53 @@
+import json
+import pytest
+
+from src.mail import EmailTransport, FileTransport, deliver
+
+
+class FlakyTransport(EmailTransport):
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.sent = []
+
+    async def send(self, params):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("provider unavailable")
+        self.sent.append(params)
+
+
+@pytest.mark.asyncio
+async def test_deliver_retries_until_success():
+    transport = FlakyTransport(failures=2)
+
+    await deliver({"email": "user@example.com", "code": "123456"}, transport, retries=3, base_delay=0)
+
+    assert len(transport.sent) == 1
+    assert transport.sent[0]["to"] == ["user@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_deliver_raises_when_retries_exhausted():
+    transport = FlakyTransport(failures=5)
+
+    with pytest.raises(ConnectionError):
+        await deliver({"email": "user@example.com", "code": "123456"}, transport, retries=2, base_delay=0)
+
+
+@pytest.mark.asyncio
+async def test_file_transport(tmp_path):
+    path = tmp_path / "emails.jsonl"
+
+    await deliver({"email": "user@example.com", "token": "abc"}, FileTransport(str(path)), retries=0, base_delay=0)
+
+    email = json.loads(path.read_text().splitlines()[0])
+    assert email["subject"] == "Reset Your Password"
+    assert "token=abc" in email["html"]
+
+
+def test_transport_without_send_cannot_be_built():
+    class Incomplete(EmailTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()